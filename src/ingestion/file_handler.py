@@ -8,18 +8,56 @@ This module provides utilities for:
 - Batch file discovery with filtering
 """
 
+import errno
 import logging
 import os
+import platform
+import re
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import Any, List, Optional, Tuple, Dict, Iterator, Set
 from enum import Enum
 
+import numpy as np
+from lxml import etree
+
 from src.utils.logger import get_logger
 from src.utils.settings import get_settings
 
+try:
+    import liburing
+except ImportError:  # Optional: io_uring batch validation on Linux only
+    liburing = None
+
 logger = get_logger(__name__)
 settings = get_settings()
 
+_IO_URING_AVAILABLE = liburing is not None and platform.system() == "Linux"
+
+# Leading bytes checked by instance validation, and the per-file stride used
+# when batch headers share one buffer
+_XML_DECLARATION = b'<?xml'
+_XML_DECLARATION_ARRAY = np.frombuffer(_XML_DECLARATION, dtype=np.uint8)
+_HEADER_STRIDE = 8
+
+# Bytes fed to the well-formedness parser per read
+_WELL_FORMED_CHUNK = 1 << 20
+
+
+class _DiscardTarget:
+    """
+    lxml parser target with no event callbacks.
+    
+    libxml2 still checks the whole document, but no tree is built, so memory
+    stays flat however large the file is.
+    """
+    
+    def close(self) -> None:
+        return None
+
 
 class XBRLFileType(str, Enum):
     """Types of XBRL-related files."""
@@ -40,6 +78,169 @@ class InvalidFileError(Exception):
     pass
 
 
+@lru_cache(maxsize=4096)
+def _resolve_cached(file_path: str, base: str, root: str) -> Optional[str]:
+    """
+    Probe the locations resolve_path tries, memoizing hits and misses.
+    
+    Absolute paths are checked as-is; relative paths are tried against base,
+    then root. Returns the resolved path string or None. Results persist for
+    the process - call _resolve_cached.cache_clear() after files are added or
+    removed.
+    """
+    path = Path(file_path)
+    
+    if path.is_absolute():
+        return file_path if path.exists() else None
+    
+    for candidate in (Path(base) / path, Path(root) / path):
+        if candidate.exists():
+            return str(candidate)
+    
+    return None
+
+
+class _IoUringValidator:
+    """
+    Batch instance validation over io_uring (Linux with the liburing package).
+    
+    Each batch is submitted in three rounds - statx, open, then a read of the
+    XML declaration hard-linked to a close - so N files cost a few
+    io_uring_enter calls instead of ~4N individual syscalls. Results match
+    XBRLFileHandler.validate_instance_file.
+    """
+    
+    QUEUE_DEPTH = 256
+    
+    def validate(self, file_paths: List[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Validate files in batches sized to fit the submission queue.
+        
+        Raises:
+            OSError: If the ring cannot be set up (e.g. io_uring is disabled)
+        """
+        ring = liburing.Ring()
+        cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(self.QUEUE_DEPTH, ring)
+        
+        # read + close take two entries per file
+        batch_size = self.QUEUE_DEPTH // 2
+        results = {}
+        try:
+            for start in range(0, len(file_paths), batch_size):
+                batch = file_paths[start:start + batch_size]
+                results.update(self._validate_batch(ring, cqe, batch))
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        
+        return results
+    
+    def _validate_batch(
+        self,
+        ring,
+        cqe,
+        file_paths: List[str]
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Run the statx/open/read rounds for one batch of files."""
+        results = {}
+        
+        # Round 1: stat every file
+        stats = [liburing.Statx() for _ in file_paths]
+        for i, file_path in enumerate(file_paths):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_statx(sqe, stats[i], os.fspath(file_path))
+            liburing.io_uring_sqe_set_data64(sqe, i)
+        completions = self._submit_and_reap(ring, cqe, len(file_paths))
+        
+        candidates = []
+        for i, file_path in enumerate(file_paths):
+            res = completions[i]
+            if isinstance(res, OSError):
+                if res.errno in (errno.ENOENT, errno.ENOTDIR):
+                    error = f"File not found: {file_path}"
+                else:
+                    error = f"Cannot read file: {str(res)}"
+            elif not stat.S_ISREG(stats[i].mode):
+                error = f"Path is not a file: {file_path}"
+            elif Path(file_path).suffix.lower() != '.xml':
+                error = f"File is not an XML file: {file_path}"
+            else:
+                candidates.append(i)
+                continue
+            logger.warning(error)
+            results[file_path] = (False, error)
+        
+        # Round 2: open the regular .xml files
+        for i in candidates:
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_open(sqe, os.fspath(file_paths[i]), os.O_RDONLY)
+            liburing.io_uring_sqe_set_data64(sqe, i)
+        completions = self._submit_and_reap(ring, cqe, len(candidates))
+        
+        opened = {}
+        for i in candidates:
+            res = completions[i]
+            if isinstance(res, OSError):
+                error = f"Cannot read file: {str(res)}"
+                logger.warning(error)
+                results[file_paths[i]] = (False, error)
+            else:
+                opened[i] = res
+        
+        # Round 3: read the declaration; the hard link closes the fd even if
+        # the read fails
+        buffers = {i: bytearray(5) for i in opened}
+        for i, fd in opened.items():
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read(sqe, fd, buffers[i])
+            liburing.io_uring_sqe_set_data64(sqe, 2 * i)
+            liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_HARDLINK)
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_close(sqe, fd)
+            liburing.io_uring_sqe_set_data64(sqe, 2 * i + 1)
+        completions = self._submit_and_reap(ring, cqe, 2 * len(opened))
+        
+        for i in opened:
+            file_path = file_paths[i]
+            res = completions[2 * i]
+            if isinstance(res, OSError):
+                error = f"Cannot read file: {str(res)}"
+                logger.warning(error)
+                results[file_path] = (False, error)
+                continue
+            
+            if bytes(buffers[i][:res]) != _XML_DECLARATION:
+                logger.warning(f"File does not appear to be XML: {file_path}")
+                # Not necessarily invalid - some files omit declaration
+            
+            logger.debug(f"File validation passed: {file_path}")
+            results[file_path] = (True, None)
+        
+        return results
+    
+    def _submit_and_reap(self, ring, cqe, count: int) -> Dict[int, Any]:
+        """
+        Submit queued entries and collect their completions by user data.
+        
+        Failed operations are returned as OSError instances.
+        """
+        completions = {}
+        if not count:
+            return completions
+        
+        liburing.io_uring_submit_and_wait(ring, count)
+        for _ in range(count):
+            liburing.io_uring_wait_cqe(ring, cqe)
+            entry = cqe[0]
+            try:
+                completions[entry.user_data] = entry.res
+            except OSError as e:
+                completions[entry.user_data] = e
+            liburing.io_uring_cqe_seen(ring, entry)
+        
+        return completions
+
+
 class XBRLFileHandler:
     """
     Handles XBRL file discovery, validation, and path resolution.
@@ -72,13 +273,59 @@ class XBRLFileHandler:
         '_ref.xsd', '-schema.xsd', '.xsd'
     }
     
+    LINKBASE_INDICATORS = {'_del', '_pre', '_cal', '_def', '_lab', '_ref'}
+    
+    # Indicator sets compiled once into case-insensitive alternations so a
+    # filename is classified with a single regex search
+    _INSTANCE_RE = re.compile(
+        "|".join(re.escape(s) for s in sorted(INSTANCE_INDICATORS, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+    _SCHEMA_RE = re.compile(
+        "|".join(re.escape(s) for s in sorted(SCHEMA_INDICATORS, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+    _LINKBASE_RE = re.compile(
+        "|".join(re.escape(s) for s in sorted(LINKBASE_INDICATORS, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+    _TAXONOMY_DIRS_CI = frozenset(d.lower() for d in TAXONOMY_DIRS)
+    # Matches a whole taxonomy directory component under either separator
+    _TAXONOMY_PATH_RE = re.compile(
+        r"(?:^|[\\/])(?:"
+        + "|".join(re.escape(d) for d in sorted(TAXONOMY_DIRS, key=len, reverse=True))
+        + r")(?:[\\/]|$)",
+        re.IGNORECASE
+    )
+    
+    # File types decided by extension alone; .xml needs name heuristics
+    _SUFFIX_DISPATCH = {
+        '.xsd': XBRLFileType.SCHEMA,
+        '.css': XBRLFileType.STYLESHEET,
+    }
+    
     def __init__(self):
         """Initialize file handler."""
-        self.raw_data_path = settings.data_path / "raw"
-        self.processed_data_path = settings.data_path / "processed"
-        self.artifact_path = settings.data_path / "artifacts"
+        self._io_uring = _IoUringValidator() if _IO_URING_AVAILABLE else None
+        # Per-thread well-formedness parser, created on first use
+        self._parsers = threading.local()
         logger.info(f"File handler initialized with root: {settings.data_path}")
     
+    @cached_property
+    def raw_data_path(self) -> Path:
+        """Default search root for raw filings (data/raw/)."""
+        return settings.data_path / "raw"
+    
+    @cached_property
+    def processed_data_path(self) -> Path:
+        """Output directory for processed data (data/processed/)."""
+        return settings.data_path / "processed"
+    
+    @cached_property
+    def artifact_path(self) -> Path:
+        """Output directory for pipeline artifacts (data/artifacts/)."""
+        return settings.data_path / "artifacts"
+    
     def find_instances(
         self,
         directory: Optional[str] = None,
@@ -96,28 +343,46 @@ class XBRLFileHandler:
         Returns:
             List of Path objects for instance files
         """
-        search_dir = Path(directory or self.raw_data_path)
+        instances = list(self.iter_instances(directory, recursive, pattern))
+        logger.info(f"Found {len(instances)} instance file(s)")
+        return instances
+    
+    def iter_instances(
+        self,
+        directory: Optional[str] = None,
+        recursive: bool = True,
+        pattern: Optional[str] = None
+    ) -> Iterator[Path]:
+        """
+        Lazily yield XBRL instance files in a directory.
+        
+        Streaming variant of find_instances; takes the same arguments.
+        
+        Yields:
+            Path objects for instance files
+        """
+        search_dir = self.raw_data_path if directory is None else Path(directory)
         
         if not search_dir.exists():
             logger.warning(f"Search directory does not exist: {search_dir}")
-            return []
+            return
         
         logger.debug(f"Searching for instances in {search_dir} (recursive={recursive})")
         
-        instances = []
-        glob_pattern = f"**/*.xml" if recursive else "*.xml"
-        
-        for file_path in search_dir.glob(glob_pattern):
-            # Filter out taxonomy/schema files
-            if self._is_instance_file(file_path):
-                instances.append(file_path)
-                logger.debug(f"Found instance: {file_path.name}")
-        
-        if pattern:
-            instances = [f for f in instances if pattern.lower() in f.name.lower()]
+        pattern_lower = pattern.lower() if pattern else None
         
-        logger.info(f"Found {len(instances)} instance file(s)")
-        return instances
+        # Taxonomy directories are pruned by the walk, so only the filename
+        # needs checking here
+        for entry in self._iter_xbrl(
+            search_dir, {'xml'}, recursive=recursive, skip_dirs=self._TAXONOMY_DIRS_CI
+        ):
+            name = entry.name
+            if pattern_lower and pattern_lower not in name.lower():
+                continue
+            
+            if self._is_instance_file_name(name):
+                logger.debug(f"Found instance: {name}")
+                yield Path(entry.path)
     
     def find_schemas(
         self,
@@ -134,23 +399,34 @@ class XBRLFileHandler:
         Returns:
             List of Path objects for schema files
         """
-        search_dir = Path(directory or self.raw_data_path)
+        schemas = list(self.iter_schemas(directory, recursive))
+        logger.info(f"Found {len(schemas)} schema file(s)")
+        return schemas
+    
+    def iter_schemas(
+        self,
+        directory: Optional[str] = None,
+        recursive: bool = True
+    ) -> Iterator[Path]:
+        """
+        Lazily yield XBRL schema files in a directory.
+        
+        Streaming variant of find_schemas; takes the same arguments.
+        
+        Yields:
+            Path objects for schema files
+        """
+        search_dir = self.raw_data_path if directory is None else Path(directory)
         
         if not search_dir.exists():
             logger.warning(f"Search directory does not exist: {search_dir}")
-            return []
+            return
         
         logger.debug(f"Searching for schemas in {search_dir} (recursive={recursive})")
         
-        schemas = []
-        glob_pattern = f"**/*.xsd" if recursive else "*.xsd"
-        
-        for file_path in search_dir.glob(glob_pattern):
-            schemas.append(file_path)
-            logger.debug(f"Found schema: {file_path.name}")
-        
-        logger.info(f"Found {len(schemas)} schema file(s)")
-        return schemas
+        for entry in self._iter_xbrl(search_dir, {'xsd'}, recursive=recursive):
+            logger.debug(f"Found schema: {entry.name}")
+            yield Path(entry.path)
     
     def find_all_xbrl_files(
         self,
@@ -167,7 +443,7 @@ class XBRLFileHandler:
         Returns:
             Dictionary mapping file types to lists of paths
         """
-        search_dir = Path(directory or self.raw_data_path)
+        search_dir = self.raw_data_path if directory is None else Path(directory)
         
         result = {
             XBRLFileType.INSTANCE: [],
@@ -180,20 +456,61 @@ class XBRLFileHandler:
         if not search_dir.exists():
             return result
         
-        glob_pattern = f"**/*" if recursive else "*"
-        
-        for file_path in search_dir.glob(glob_pattern):
-            if not file_path.is_file():
-                continue
-            
-            if file_path.suffix not in {'.xml', '.xsd', '.css'}:
-                continue
-            
-            file_type = self.detect_file_type(file_path)
+        for entry in self._iter_xbrl(
+            search_dir, {'xml', 'xsd', 'css'}, recursive=recursive
+        ):
+            # Classify from the entry name; the Path is only built to store it
+            file_type = self._classify_suffix(entry.name)
+            file_path = Path(entry.path)
+            if file_type is XBRLFileType.INSTANCE and self._in_taxonomy_dir(file_path):
+                file_type = XBRLFileType.OTHER
             result[file_type].append(file_path)
         
         return result
     
+    def _iter_xbrl(
+        self,
+        root: Path,
+        want_suffixes: Set[str],
+        recursive: bool = True,
+        skip_dirs: Set[str] = frozenset()
+    ) -> Iterator[os.DirEntry]:
+        """
+        Walk a directory tree with os.scandir, yielding matching file entries.
+        
+        Directories whose lowercased name is in skip_dirs are pruned before
+        descending, so their contents are never listed.
+        
+        Args:
+            root: Directory to start from
+            want_suffixes: Extensions to keep, without the dot (e.g. {'xml'})
+            recursive: Whether to descend into subdirectories
+            skip_dirs: Directory names to prune from the walk
+            
+        Yields:
+            os.DirEntry for each regular file with a wanted extension
+        """
+        stack = [root]
+        
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name.lower() not in skip_dirs:
+                                stack.append(entry.path)
+                            continue
+                        
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        
+                        _, dot, suffix = entry.name.rpartition('.')
+                        if dot and suffix in want_suffixes:
+                            yield entry
+            except OSError as e:
+                logger.warning(f"Cannot scan directory {directory}: {str(e)}")
+    
     def detect_file_type(self, file_path: Path) -> XBRLFileType:
         """
         Detect the type of XBRL file.
@@ -207,26 +524,51 @@ class XBRLFileHandler:
         if not isinstance(file_path, Path):
             file_path = Path(file_path)
         
-        name_lower = file_path.name.lower()
-        suffix = file_path.suffix.lower()
+        return self._classify(file_path.name, str(file_path.parent))
+    
+    def _classify(self, name: str, parent: str) -> XBRLFileType:
+        """
+        Detect the file type from a filename and its parent directory string.
         
-        # Check by extension first
-        if suffix == '.xsd':
-            return XBRLFileType.SCHEMA
+        Instances inside taxonomy directories are reported as OTHER.
+        """
+        file_type = self._classify_suffix(name)
+        if file_type is XBRLFileType.INSTANCE and self._TAXONOMY_PATH_RE.search(parent):
+            return XBRLFileType.OTHER
         
-        if suffix == '.css':
-            return XBRLFileType.STYLESHEET
+        return file_type
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_suffix(name: str) -> XBRLFileType:
+        """
+        Detect the file type from a filename alone.
+        
+        A pure string check with no filesystem access, memoized by name: the
+        same files are classified again by find_all_xbrl_files,
+        detect_file_type and get_file_info, and a cache hit skips the
+        indicator regexes. Taxonomy-directory exclusion of instances is left
+        to the caller (see detect_file_type).
+        """
+        # Same rule as Path.suffix: a leading or trailing dot is not a suffix
+        dot = name.rfind('.')
+        suffix = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+        
+        # Check by extension first - one dict lookup settles most files
+        file_type = XBRLFileHandler._SUFFIX_DISPATCH.get(suffix)
+        if file_type is not None:
+            return file_type
         
         if suffix != '.xml':
             return XBRLFileType.OTHER
         
         # For .xml files, check content hints
+        name_lower = name.lower()
         if 'linkbase' in name_lower or '-' in name_lower:
-            if any(indicator in name_lower for indicator in
-                   {'_del', '_pre', '_cal', '_def', '_lab', '_ref'}):
+            if XBRLFileHandler._LINKBASE_RE.search(name_lower):
                 return XBRLFileType.LINKBASE
         
-        if self._is_instance_file(file_path):
+        if XBRLFileHandler._is_instance_file_name(name):
             return XBRLFileType.INSTANCE
         
         # Default for .xml
@@ -238,67 +580,146 @@ class XBRLFileHandler:
         
         Uses heuristics since full validation requires XML parsing.
         """
-        name_lower = file_path.name.lower()
+        # Only .xml files can be instances - cheapest check first
+        if file_path.suffix.lower() != '.xml':
+            return False
         
-        # Check positive indicators
-        for indicator in self.INSTANCE_INDICATORS:
-            if indicator.lower() in name_lower:
-                return True
+        # Exclude taxonomy directories, consistent with the pruned walk
+        if self._in_taxonomy_dir(file_path):
+            return False
         
-        # Exclude known schema/taxonomy patterns
-        for indicator in self.SCHEMA_INDICATORS:
-            if indicator.lower() in name_lower:
-                return False
+        return self._is_instance_file_name(file_path.name)
+    
+    def _in_taxonomy_dir(self, file_path: Path) -> bool:
+        """Check whether any parent directory of a file is a taxonomy directory."""
+        # One regex scan of the parent path string instead of building .parts
+        return self._TAXONOMY_PATH_RE.search(str(file_path.parent)) is not None
+    
+    @staticmethod
+    def _is_instance_file_name(name: str) -> bool:
+        """
+        Filename-only variant of _is_instance_file.
+        
+        Used by the directory walk, which already prunes taxonomy directories.
+        """
+        if XBRLFileHandler._INSTANCE_RE.search(name):
+            return True
         
-        # Exclude taxonomy directories
-        for part in file_path.parts:
-            if part.lower() in self.TAXONOMY_DIRS:
-                return False
+        if XBRLFileHandler._SCHEMA_RE.search(name):
+            return False
         
-        # Default: if it's an .xml file and not excluded, treat as instance
-        return file_path.suffix.lower() == '.xml'
+        return name.lower().endswith('.xml')
     
-    def validate_instance_file(self, file_path: str) -> Tuple[bool, Optional[str]]:
+    def validate_instance_file(
+        self,
+        file_path: str,
+        check_well_formed: bool = False
+    ) -> Tuple[bool, Optional[str]]:
         """
         Validate that a file exists and appears to be a valid XBRL instance.
         
         Args:
             file_path: Path to validate
+            check_well_formed: Also stream the file through the tree-less
+                lxml parser to confirm it is well-formed XML
             
         Returns:
             Tuple of (is_valid, error_message)
         """
-        path = Path(file_path)
+        header = bytearray(len(_XML_DECLARATION))
+        error = self._read_instance_header(file_path, memoryview(header))
+        if error is not None:
+            return False, error
+        
+        if header != _XML_DECLARATION:
+            logger.warning(f"File does not appear to be XML: {file_path}")
+            # Not necessarily invalid - some files omit declaration
+        
+        if check_well_formed:
+            error = self._check_well_formed(file_path)
+            if error is not None:
+                return False, error
+        
+        logger.debug(f"File validation passed: {file_path}")
+        return True, None
+    
+    def validate_instance_bytes(self, data: bytes, name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate in-memory instance content without touching the filesystem.
+        
+        Applies the same filename check as validate_instance_file, then
+        checks the bytes are well-formed XML with lxml.
+        
+        Args:
+            data: Raw document bytes
+            name: Filename the content would have on disk
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not name.lower().endswith('.xml'):
+            error = f"File is not an XML file: {name}"
+            logger.warning(error)
+            return False, error
         
-        if not path.exists():
-            error = f"File not found: {file_path}"
+        try:
+            parser = self._well_formed_parser()
+            parser.feed(data)
+            parser.close()
+        except etree.XMLSyntaxError as e:
+            error = f"File is not well-formed XML: {name} ({str(e)})"
             logger.warning(error)
             return False, error
         
-        if not path.is_file():
+        logger.debug(f"File validation passed: {name}")
+        return True, None
+    
+    def _read_instance_header(self, file_path: str, header: memoryview) -> Optional[str]:
+        """
+        Run the file checks for validate_instance_file and read its first bytes.
+        
+        The leading bytes are read straight into header (zero-filled past EOF)
+        so batch callers can hand out slices of one shared buffer.
+        
+        Returns:
+            Error message (already logged), or None if the file passed
+        """
+        path = Path(file_path)
+        
+        # One stat call answers both "exists" and "is a regular file"
+        # (matched by errno, as this module's FileNotFoundError shadows the builtin)
+        try:
+            st = os.stat(os.fspath(path))
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.ENOTDIR):
+                error = f"File not found: {file_path}"
+            else:
+                error = f"Cannot read file: {str(e)}"
+            logger.warning(error)
+            return error
+        
+        if not stat.S_ISREG(st.st_mode):
             error = f"Path is not a file: {file_path}"
             logger.warning(error)
-            return False, error
+            return error
         
         if path.suffix.lower() != '.xml':
             error = f"File is not an XML file: {file_path}"
             logger.warning(error)
-            return False, error
+            return error
         
         try:
-            # Basic XML validation - check if file is readable
-            with open(path, 'r', encoding='utf-8') as f:
-                first_line = f.readline()
-                if not first_line.startswith('<?xml'):
-                    logger.warning(f"File does not appear to be XML: {file_path}")
-                    # Not necessarily invalid - some files omit declaration
-        except Exception as e:
+            # Basic XML validation - check if file is readable. An unbuffered
+            # binary read straight into header avoids text-mode buffering,
+            # decoding and a copy, and works on every platform.
+            with open(path, 'rb', buffering=0) as f:
+                f.readinto(header)
+        except OSError as e:
             error = f"Cannot read file: {str(e)}"
             logger.warning(error)
-            return False, error
+            return error
         
-        logger.debug(f"File validation passed: {file_path}")
-        return True, None
+        return None
     
     def resolve_path(self, file_path: str, base_dir: Optional[str] = None) -> Path:
         """
@@ -315,31 +736,21 @@ class XBRLFileHandler:
             FileNotFoundError: If path cannot be resolved
         """
         path = Path(file_path)
+        base = self.raw_data_path if base_dir is None else Path(base_dir)
         
-        # If already absolute, return as-is
-        if path.is_absolute():
-            if path.exists():
-                return path
-            raise FileNotFoundError(f"Absolute path does not exist: {file_path}")
-        
-        # Try relative to base directory
-        base = Path(base_dir or self.raw_data_path)
-        resolved = base / path
-        
-        if resolved.exists():
-            logger.debug(f"Resolved path: {resolved}")
-            return resolved
-        
-        # Try relative to workspace root
-        workspace_path = settings.root_path / path
-        if workspace_path.exists():
-            logger.debug(f"Resolved path: {workspace_path}")
-            return workspace_path
-        
-        raise FileNotFoundError(
-            f"Cannot resolve path: {file_path} "
-            f"(tried {base} and {settings.root_path})"
-        )
+        resolved = _resolve_cached(str(path), str(base), str(settings.root_path))
+        
+        if resolved is None:
+            # If already absolute, no other location was tried
+            if path.is_absolute():
+                raise FileNotFoundError(f"Absolute path does not exist: {file_path}")
+            raise FileNotFoundError(
+                f"Cannot resolve path: {file_path} "
+                f"(tried {base} and {settings.root_path})"
+            )
+        
+        logger.debug(f"Resolved path: {resolved}")
+        return Path(resolved)
     
     def get_file_info(self, file_path: str) -> Dict[str, any]:
         """
@@ -353,43 +764,227 @@ class XBRLFileHandler:
         """
         path = Path(file_path)
         
-        if not path.exists():
-            return {"exists": False}
+        # One stat call answers "exists" and supplies every other field
+        # (matched by errno, as this module's FileNotFoundError shadows the builtin)
+        try:
+            stat_info = os.stat(path)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.ENOTDIR, errno.ELOOP):
+                return {"exists": False}
+            logger.error(f"Error getting file info: {str(e)}")
+            return {"exists": True, "error": str(e)}
+        
+        return self._file_info_from_stat(
+            str(path.absolute()), path.name, str(path.parent), stat_info
+        )
+    
+    def get_file_info_from_entry(self, entry: os.DirEntry) -> Dict[str, Any]:
+        """
+        Get metadata about a file found during a directory walk.
+        
+        Uses the entry's cached stat result, so a walk can reuse the stat
+        os.scandir already made (none at all on platforms that return it with
+        the directory listing).
         
+        Args:
+            entry: Directory entry from os.scandir
+            
+        Returns:
+            Dictionary with file metadata, same keys as get_file_info
+        """
         try:
-            stat_info = path.stat()
-            return {
-                "exists": True,
-                "path": str(path.absolute()),
-                "name": path.name,
-                "size_bytes": stat_info.st_size,
-                "file_type": self.detect_file_type(path).value,
-                "extension": path.suffix,
-                "is_file": path.is_file(),
-                "is_dir": path.is_dir(),
-                "modified": stat_info.st_mtime,
-            }
-        except Exception as e:
+            return self._file_info_from_stat(
+                os.path.abspath(entry.path),
+                entry.name,
+                os.path.dirname(entry.path),
+                entry.stat(),
+            )
+        except OSError as e:
             logger.error(f"Error getting file info: {str(e)}")
             return {"exists": True, "error": str(e)}
     
-    def batch_validate_instances(self, file_paths: List[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+    def iter_file_info(
+        self,
+        directory: Optional[Path] = None,
+        recursive: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield metadata for every XBRL-related file under a directory.
+        
+        Args:
+            directory: Directory to search (default: raw_data_path)
+            recursive: Whether to search subdirectories
+            
+        Yields:
+            File metadata dictionaries as returned by get_file_info
+        """
+        search_dir = self.raw_data_path if directory is None else Path(directory)
+        
+        if not search_dir.exists():
+            return
+        
+        for entry in self._iter_xbrl(
+            search_dir, {'xml', 'xsd', 'css'}, recursive=recursive
+        ):
+            yield self.get_file_info_from_entry(entry)
+    
+    def _file_info_from_stat(
+        self,
+        abs_path: str,
+        name: str,
+        parent: str,
+        stat_info: os.stat_result
+    ) -> Dict[str, Any]:
+        """Build the get_file_info dictionary from a single stat result."""
+        dot = name.rfind('.')
+        return {
+            "exists": True,
+            "path": abs_path,
+            "name": name,
+            "size_bytes": stat_info.st_size,
+            "file_type": self._classify(name, parent).value,
+            "extension": name[dot:] if 0 < dot < len(name) - 1 else '',
+            "is_file": stat.S_ISREG(stat_info.st_mode),
+            "is_dir": stat.S_ISDIR(stat_info.st_mode),
+            "modified": stat_info.st_mtime,
+        }
+    
+    def batch_validate_instances(
+        self,
+        file_paths: List[str],
+        check_well_formed: bool = False
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
         """
         Validate multiple instance files at once.
         
         Args:
             file_paths: List of file paths to validate
+            check_well_formed: Also stream each file that passes the header
+                checks through lxml to confirm it is well-formed XML
             
         Returns:
             Dictionary mapping file paths to (is_valid, error) tuples
         """
+        results = self._batch_check_headers(file_paths)
+        
+        if check_well_formed:
+            for file_path, (valid, _) in results.items():
+                if not valid:
+                    continue
+                error = self._check_well_formed(file_path)
+                if error is not None:
+                    results[file_path] = (False, error)
+        
+        return self._log_batch_summary(results, len(file_paths))
+    
+    def _batch_check_headers(self, file_paths: List[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Run the validate_instance_file checks over a batch of files."""
+        if self._io_uring is not None:
+            try:
+                batch = self._io_uring.validate(file_paths)
+                return {file_path: batch[file_path] for file_path in file_paths}
+            except Exception as e:
+                # liburing's bindings surface ring setup and kernel support
+                # problems as more than OSError; any failure here falls back
+                logger.warning(f"io_uring unavailable, using thread pool: {str(e)}")
+                self._io_uring = None
+        
+        # Each file's header is read into its own stride of one shared slab,
+        # so all declarations are checked in a single NumPy comparison
+        stride = _HEADER_STRIDE
+        slab = bytearray(stride * len(file_paths))
+        view = memoryview(slab)
+        
+        def read_header(index: int) -> Optional[str]:
+            start = index * stride
+            return self._read_instance_header(
+                file_paths[index], view[start:start + len(_XML_DECLARATION)]
+            )
+        
+        # Validation is syscall-bound, so a thread pool hides per-file latency;
+        # executor.map preserves input order
+        max_workers = min(32, max(1, len(file_paths)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            errors = list(executor.map(read_header, range(len(file_paths))))
+        
+        headers = np.frombuffer(slab, dtype=np.uint8).reshape(-1, stride)
+        has_declaration = (headers[:, :len(_XML_DECLARATION)] == _XML_DECLARATION_ARRAY).all(axis=1)
+        
         results = {}
-        for file_path in file_paths:
-            is_valid, error = self.validate_instance_file(file_path)
-            results[file_path] = (is_valid, error)
+        for file_path, error, declared in zip(file_paths, errors, has_declaration):
+            if error is not None:
+                results[file_path] = (False, error)
+                continue
+            
+            if not declared:
+                logger.warning(f"File does not appear to be XML: {file_path}")
+                # Not necessarily invalid - some files omit declaration
+            
+            logger.debug(f"File validation passed: {file_path}")
+            results[file_path] = (True, None)
+        
+        return results
+    
+    def _well_formed_parser(self) -> etree.XMLParser:
+        """
+        This thread's reusable well-formedness parser.
+        
+        lxml resets a parser on close() (or after a syntax error), so one
+        libxml2 parser context serves every file the thread checks. Ids are
+        not collected and entities and network fetches are never resolved.
+        """
+        parser = getattr(self._parsers, 'parser', None)
+        if parser is None:
+            parser = etree.XMLParser(
+                target=_DiscardTarget(), huge_tree=True, resolve_entities=False,
+                collect_ids=False, no_network=True
+            )
+            self._parsers.parser = parser
+        return parser
+    
+    def _check_well_formed(self, file_path: str) -> Optional[str]:
+        """
+        Stream a file through the reusable parser to check it is well-formed.
+        
+        The file is fed in chunks to a parser that builds no tree, so memory
+        stays flat however large the filing is.
         
+        Returns:
+            Error message (already logged), or None if the file parsed
+        """
+        parser = self._well_formed_parser()
+        try:
+            with open(file_path, 'rb') as f:
+                while True:
+                    chunk = f.read(_WELL_FORMED_CHUNK)
+                    if not chunk:
+                        break
+                    parser.feed(chunk)
+            parser.close()
+        except etree.XMLSyntaxError as e:
+            error = f"File is not well-formed XML: {file_path} ({str(e)})"
+            logger.warning(error)
+            return error
+        except OSError as e:
+            # Drop the partly fed document so the next file starts clean
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            error = f"Cannot read file: {str(e)}"
+            logger.warning(error)
+            return error
+        
+        return None
+    
+    def _log_batch_summary(
+        self,
+        results: Dict[str, Tuple[bool, Optional[str]]],
+        total: int
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Log the valid/total count for a batch and return its results."""
         valid_count = sum(1 for valid, _ in results.values() if valid)
-        logger.info(f"Batch validation: {valid_count}/{len(file_paths)} files valid")
+        logger.info(f"Batch validation: {valid_count}/{total} files valid")
         
         return results
 
@@ -6,14 +6,49 @@ This module defines Pydantic v2 models for core XBRL entities:
 - XBRLUnit: Measurement units (monetary, shares, pure)
 - XBRLDimension: Dimensional information for facts
 - XBRLFact: Individual data facts from XBRL instance documents
+- XBRLFactTable: Columnar (pyarrow) storage for bulk facts
 """
 
+import sys
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, List, Optional, Dict
+from types import MappingProxyType
+from typing import Any, ClassVar, Iterator, List, Mapping, Optional, Dict, Sequence
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import (
+    BaseModel, Field, PrivateAttr, computed_field, field_serializer, field_validator, ConfigDict
+)
+
+from src.utils.settings import get_settings
+
+try:
+    import numba
+except ImportError:  # optional: compiled numeric normalization
+    numba = None
+
+settings = get_settings()
+
+
+# Shared read-only results for optional collections that are usually empty,
+# so facts and contexts do not each allocate their own empty list/dict
+_EMPTY_TUPLE: tuple = ()
+_EMPTY_DICT: Mapping[str, str] = MappingProxyType({})
+
+
+def _provenance_timestamp() -> Optional[datetime]:
+    """
+    Per-object parse timestamp for contexts, units and facts.
+    
+    Only recorded when settings.debug_provenance is enabled; otherwise the
+    timestamp on XBRLInstance covers the whole parse.
+    """
+    if settings.debug_provenance:
+        return datetime.utcnow()
+    return None
 
 
 class DimensionMemberType(str, Enum):
@@ -43,6 +78,9 @@ class XBRLDimension(BaseModel):
     
     Dimensions are used to add non-monetary qualitative context to facts
     (e.g., business segments, geographic regions, product lines).
+    
+    Immutable and hashable, so contexts with the same member can share one
+    instance (the parser does this).
     """
     
     dimension_name: str = Field(
@@ -62,7 +100,7 @@ class XBRLDimension(BaseModel):
         description="Whether this is the default member for the dimension"
     )
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    model_config = ConfigDict(frozen=True)
 
 
 class XBRLContext(BaseModel):
@@ -70,7 +108,7 @@ class XBRLContext(BaseModel):
     Represents a context in an XBRL instance document.
     
     Contexts define the period, scenario, and entity information
-    for one or more facts.
+    for one or more facts. Contexts are frozen and may be shared.
     """
     
     context_id: str = Field(
@@ -97,17 +135,17 @@ class XBRLContext(BaseModel):
         default=None,
         description="End date for instant or duration periods"
     )
-    segment_dimensions: List[XBRLDimension] = Field(
-        default_factory=list,
-        description="Dimensional qualifiers for this context (segment)"
+    segment_dimensions: Optional[List[XBRLDimension]] = Field(
+        default=None,
+        description="Dimensional qualifiers for this context (segment); None if there are none"
     )
-    scenario_dimensions: List[XBRLDimension] = Field(
-        default_factory=list,
-        description="Dimensional qualifiers for scenarios"
+    scenario_dimensions: Optional[List[XBRLDimension]] = Field(
+        default=None,
+        description="Dimensional qualifiers for scenarios; None if there are none"
     )
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Timestamp when context was parsed"
+    created_at: Optional[datetime] = Field(
+        default_factory=_provenance_timestamp,
+        description="Timestamp when context was parsed (only set with DEBUG_PROVENANCE)"
     )
 
     @field_validator('period_start', 'period_end')
@@ -121,7 +159,15 @@ class XBRLContext(BaseModel):
                 raise ValueError(f"Invalid date format: {v}") from e
         return v
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    def get_segment_dimensions(self) -> Sequence[XBRLDimension]:
+        """Segment dimensions, or a shared empty tuple when there are none."""
+        return self.segment_dimensions or _EMPTY_TUPLE
+
+    def get_scenario_dimensions(self) -> Sequence[XBRLDimension]:
+        """Scenario dimensions, or a shared empty tuple when there are none."""
+        return self.scenario_dimensions or _EMPTY_TUPLE
+
+    model_config = ConfigDict(frozen=True)
 
 
 class XBRLUnit(BaseModel):
@@ -129,6 +175,7 @@ class XBRLUnit(BaseModel):
     Represents a unit of measurement in an XBRL instance document.
     
     Units define how numeric facts are measured (currency, shares, percentages, etc.).
+    Units are frozen and may be shared.
     """
     
     unit_id: str = Field(
@@ -155,9 +202,9 @@ class XBRLUnit(BaseModel):
         default=None,
         description="Human-readable label for this unit"
     )
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Timestamp when unit was parsed"
+    created_at: Optional[datetime] = Field(
+        default_factory=_provenance_timestamp,
+        description="Timestamp when unit was parsed (only set with DEBUG_PROVENANCE)"
     )
 
     @field_validator('iso_currency_code', 'numerator_iso_code', 'denominator_iso_code')
@@ -168,7 +215,7 @@ class XBRLUnit(BaseModel):
             return v.upper()
         return v
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    model_config = ConfigDict(frozen=True)
 
 
 class XBRLFact(BaseModel):
@@ -176,12 +223,15 @@ class XBRLFact(BaseModel):
     Represents a single fact in an XBRL instance document.
     
     A fact is a data point with a concept, value, context, and optional unit.
+    
+    Instances hold up to hundreds of thousands of facts, so the parser builds
+    them with `model_construct()` from already-normalized values (stripped
+    strings, int decimals) and skips per-fact validation. Other callers should
+    use the regular constructor. Strings are not stripped by the models;
+    whitespace is removed once where text leaves the XML. Facts are frozen;
+    use `model_copy(update=...)` to derive a modified fact.
     """
     
-    fact_id: str = Field(
-        default_factory=lambda: str(uuid4()),
-        description="Unique identifier for this fact"
-    )
     concept_qname: str = Field(
         ...,
         description="Qualified name of the concept (e.g., 'us-gaap:NetIncomeLoss')"
@@ -214,32 +264,308 @@ class XBRLFact(BaseModel):
         default=None,
         description="Sign override indicator in XBRL (e.g., '-1' for negation)"
     )
-    footnote_ids: List[str] = Field(
-        default_factory=list,
-        description="References to associated footnotes"
+    footnote_ids: Optional[List[str]] = Field(
+        default=None,
+        description="References to associated footnotes; None if there are none"
     )
     is_nil: bool = Field(
         default=False,
         description="Whether this fact has a nil (missing) value"
     )
-    xml_attributes: Dict[str, str] = Field(
-        default_factory=dict,
-        description="Additional XML attributes from the source document"
+    xml_attributes: Optional[Dict[str, str]] = Field(
+        default=None,
+        description="Additional XML attributes from the source document; None if there are none"
     )
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Timestamp when fact was parsed"
+    created_at: Optional[datetime] = Field(
+        default_factory=_provenance_timestamp,
+        description="Timestamp when fact was parsed (only set with DEBUG_PROVENANCE)"
     )
 
-    @field_validator('value')
+    # Generated on first access - most facts never have their ID read.
+    # Read and written through __pydantic_private__ directly: the computed
+    # field runs once per fact on every dump, and the private-attribute
+    # __getattr__/__setattr__ hooks cost more than the rest of the fact.
+    _fact_id: Optional[str] = PrivateAttr(default=None)
+
+    # One fields-set per distinct combination of constructed keys. Facts are
+    # frozen, so pydantic never adds to a fact's fields-set and the parser's
+    # facts can all point at the same set instead of carrying their own
+    _SHARED_FIELDS_SETS: ClassVar[Dict[frozenset, set]] = {}
+
+    def __init__(self, fact_id: Optional[str] = None, **data: Any):
+        super().__init__(**data)
+        self.__pydantic_private__['_fact_id'] = fact_id
+
+    @classmethod
+    def model_construct(cls, _fields_set: Optional[set] = None, **values: Any) -> "XBRLFact":
+        """Build a fact without validation, sharing its fields-set with like facts."""
+        if _fields_set is None:
+            keys = frozenset(values)
+            _fields_set = cls._SHARED_FIELDS_SETS.get(keys)
+            if _fields_set is None:
+                _fields_set = {name for name in keys if name in cls.model_fields}
+                cls._SHARED_FIELDS_SETS[keys] = _fields_set
+        return super().model_construct(_fields_set, **values)
+
+    @computed_field(description="Unique identifier for this fact")
+    @property
+    def fact_id(self) -> str:
+        """Unique identifier for this fact, generated lazily."""
+        private = self.__pydantic_private__
+        fact_id = private['_fact_id']
+        if fact_id is None:
+            fact_id = private['_fact_id'] = uuid4().hex
+        return fact_id
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Compare facts by their fields only.
+        
+        pydantic's default equality also compares private attributes, so
+        reading fact_id (which generates and stores one) would make a fact
+        unequal to an otherwise identical copy.
+        """
+        if isinstance(other, BaseModel):
+            return self.__class__ is other.__class__ and self.__dict__ == other.__dict__
+        return NotImplemented
+
+    @field_validator('concept_qname', 'context_ref', 'unit_ref')
     @classmethod
-    def validate_value(cls, v: Optional[Any]) -> Optional[Any]:
-        """Ensure value is properly typed (can be extended in subclasses)."""
-        if isinstance(v, str):
-            return v.strip()
+    def intern_identifiers(cls, v: Optional[str]) -> Optional[str]:
+        """Intern identifiers that repeat across facts so they share one str."""
+        if v:
+            return sys.intern(v)
         return v
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    def get_footnote_ids(self) -> Sequence[str]:
+        """Footnote references, or a shared empty tuple when there are none."""
+        return self.footnote_ids or _EMPTY_TUPLE
+
+    def get_xml_attributes(self) -> Mapping[str, str]:
+        """Extra XML attributes, or a shared read-only empty mapping when there are none."""
+        return self.xml_attributes or _EMPTY_DICT
+
+    model_config = ConfigDict(frozen=True)
+
+
+# Type of the dictionary-encoded string columns (the columnar analogue of
+# interning: each distinct string is stored once)
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+
+def _column_to_pylist(column: pa.Array) -> List[Any]:
+    """
+    Convert a column to a Python list.
+    
+    Dictionary-encoded columns are decoded through their dictionary, so rows
+    with the same value share one str object instead of each getting a copy.
+    """
+    if not pa.types.is_dictionary(column.type):
+        return column.to_pylist()
+    
+    dictionary = column.dictionary.to_pylist()
+    return [
+        None if index is None else dictionary[index]
+        for index in column.indices.to_pylist()
+    ]
+
+
+def _numeric_value_column(values: List[Any], value_types: List[str]) -> pa.DoubleArray:
+    """
+    Parse the values of numeric facts to float64 in one vectorized pass.
+    
+    Non-numeric, nil and unparseable values are null.
+    """
+    numeric = [
+        i for i, (v, t) in enumerate(zip(values, value_types))
+        if t == "numeric" and v is not None
+    ]
+    strings = [values[i] for i in numeric]
+    
+    parsed = np.full(len(values), np.nan)
+    try:
+        # NumPy converts the whole str list to float64 in C
+        parsed[numeric] = np.asarray(strings, dtype=np.float64)
+    except ValueError:
+        parsed[numeric] = [_float_or_nan(v) for v in strings]
+    
+    return pa.array(parsed, pa.float64(), mask=np.isnan(parsed))
+
+
+def _float_or_nan(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def _round_by_decimals_numpy(
+    values: np.ndarray,
+    decimals: np.ndarray,
+    has_decimals: np.ndarray
+) -> np.ndarray:
+    """Round each value to its decimals; one np.round per distinct decimals."""
+    out = values.copy()
+    for d in np.unique(decimals[has_decimals]):
+        rows = has_decimals & (decimals == d)
+        out[rows] = np.round(values[rows], int(d))
+    return out
+
+
+def _scale_by_decimals_numpy(
+    values: np.ndarray,
+    decimals: np.ndarray,
+    has_decimals: np.ndarray
+) -> np.ndarray:
+    """Divide each value by 10**-decimals where decimals is negative."""
+    exponents = np.where(has_decimals & (decimals < 0), decimals, 0)
+    return values * np.power(10.0, exponents)
+
+
+if numba is not None:
+    # No fastmath: values holds NaN for non-numeric facts, and fastmath
+    # lets LLVM assume there are none
+    @numba.njit(parallel=True, cache=True)
+    def _round_by_decimals(values, decimals, has_decimals):
+        out = np.empty_like(values)
+        for i in numba.prange(values.shape[0]):
+            if has_decimals[i]:
+                out[i] = round(values[i], decimals[i])
+            else:
+                out[i] = values[i]
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _scale_by_decimals(values, decimals, has_decimals):
+        out = np.empty_like(values)
+        for i in numba.prange(values.shape[0]):
+            if has_decimals[i] and decimals[i] < 0:
+                out[i] = values[i] * 10.0 ** decimals[i]
+            else:
+                out[i] = values[i]
+        return out
+else:
+    _round_by_decimals = _round_by_decimals_numpy
+    _scale_by_decimals = _scale_by_decimals_numpy
+
+
+class XBRLFactTable:
+    """
+    Columnar (struct-of-arrays) storage for the facts of one instance.
+    
+    Each column is a pyarrow array with one entry per fact, so scanning a
+    single field (e.g. all values) reads contiguous memory instead of
+    touching one Python object per fact. Heavily repeated strings (QNames,
+    context and unit refs) are dictionary-encoded.
+    
+    numeric_value holds the float64 parse of each numeric fact's value
+    (null otherwise). It is derived from value, so it is not one of COLUMNS.
+    
+    Use iter_facts() when per-fact XBRLFact objects are needed.
+    """
+    
+    COLUMNS = (
+        "concept_qname", "concept_label", "value", "value_type",
+        "context_ref", "unit_ref", "decimals", "is_nil",
+    )
+    
+    __slots__ = COLUMNS + ("numeric_value",)
+    
+    def __init__(
+        self,
+        concept_qname: pa.DictionaryArray,
+        concept_label: pa.Array,
+        value: pa.Array,
+        value_type: pa.DictionaryArray,
+        context_ref: pa.DictionaryArray,
+        unit_ref: pa.DictionaryArray,
+        decimals: pa.Int8Array,
+        is_nil: pa.BooleanArray,
+        numeric_value: Optional[pa.DoubleArray] = None,
+    ):
+        self.concept_qname = concept_qname
+        self.concept_label = concept_label
+        self.value = value
+        self.value_type = value_type
+        self.context_ref = context_ref
+        self.unit_ref = unit_ref
+        self.decimals = decimals
+        self.is_nil = is_nil
+        if numeric_value is None:
+            numeric_value = _numeric_value_column(
+                _column_to_pylist(value), _column_to_pylist(value_type)
+            )
+        self.numeric_value = numeric_value
+    
+    @classmethod
+    def from_pylists(cls, columns: Dict[str, List[Any]]) -> "XBRLFactTable":
+        """Build a table from per-column Python lists keyed by COLUMNS."""
+        return cls(
+            concept_qname=pa.array(columns["concept_qname"], _DICTIONARY_STRING),
+            concept_label=pa.array(columns["concept_label"], pa.string()),
+            value=pa.array(columns["value"], pa.string()),
+            value_type=pa.array(columns["value_type"], _DICTIONARY_STRING),
+            context_ref=pa.array(columns["context_ref"], _DICTIONARY_STRING),
+            unit_ref=pa.array(columns["unit_ref"], _DICTIONARY_STRING),
+            decimals=pa.array(columns["decimals"], pa.int8()),
+            is_nil=pa.array(columns["is_nil"], pa.bool_()),
+            numeric_value=_numeric_value_column(columns["value"], columns["value_type"]),
+        )
+    
+    @classmethod
+    def from_facts(cls, facts: Sequence[XBRLFact]) -> "XBRLFactTable":
+        """
+        Build a table from XBRLFact objects (the inverse of iter_facts).
+        
+        The value column is a string column, so values built as int, Decimal
+        or other non-str types are stored as their str() text.
+        """
+        columns = {name: [getattr(fact, name) for fact in facts] for name in cls.COLUMNS}
+        columns["value"] = [
+            value if value is None or isinstance(value, str) else str(value)
+            for value in columns["value"]
+        ]
+        return cls.from_pylists(columns)
+    
+    def __len__(self) -> int:
+        return len(self.concept_qname)
+    
+    def normalized_values(self) -> np.ndarray:
+        """
+        Numeric values rounded to each fact's decimals attribute.
+        
+        Facts without decimals (absent or INF) keep their parsed value;
+        non-numeric facts are NaN. Uses a compiled numba kernel when numba
+        is installed, NumPy otherwise.
+        """
+        values = self.numeric_value.to_numpy(zero_copy_only=False)
+        has_decimals = self.decimals.is_valid().to_numpy(zero_copy_only=False)
+        decimals = pc.fill_null(self.decimals, 0).to_numpy().astype(np.int64)
+        return _round_by_decimals(values, decimals, has_decimals)
+    
+    def scaled_values(self) -> np.ndarray:
+        """
+        Numeric values in the reporting scale implied by negative decimals.
+        
+        A fact with decimals=-6 is divided by 10**6 (reported in millions),
+        -3 by 10**3; facts with non-negative or no decimals keep their parsed
+        value, and non-numeric facts are NaN. Like normalized_values, uses a
+        numba kernel when numba is installed.
+        """
+        values = self.numeric_value.to_numpy(zero_copy_only=False)
+        has_decimals = self.decimals.is_valid().to_numpy(zero_copy_only=False)
+        decimals = pc.fill_null(self.decimals, 0).to_numpy().astype(np.int64)
+        return _scale_by_decimals(values, decimals, has_decimals)
+    
+    def to_arrow(self) -> pa.Table:
+        """Wrap the columns in a pyarrow Table (no copy) for vectorized analytics."""
+        return pa.table({name: getattr(self, name) for name in self.__slots__})
+    
+    def iter_facts(self) -> Iterator[XBRLFact]:
+        """Materialize each row as an XBRLFact."""
+        columns = [_column_to_pylist(getattr(self, name)) for name in self.COLUMNS]
+        for row in zip(*columns):
+            yield XBRLFact.model_construct(**dict(zip(self.COLUMNS, row)))
 
 
 class XBRLInstance(BaseModel):
@@ -278,6 +604,12 @@ class XBRLInstance(BaseModel):
         default_factory=list,
         description="All facts in this instance"
     )
+    fact_table: Optional[XBRLFactTable] = Field(
+        default=None,
+        exclude=True,
+        description="Columnar fact storage, used instead of facts for bulk ingestion; "
+                    "dumped as facts"
+    )
     schema_ref: Optional[str] = Field(
         default=None,
         description="Reference to the schema(s) this instance conforms to"
@@ -290,27 +622,112 @@ class XBRLInstance(BaseModel):
         default_factory=list,
         description="Any validation errors encountered during parsing"
     )
+    validation_passed: Optional[bool] = Field(
+        default=None,
+        description="Whether validation passed; None if the instance was not validated"
+    )
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
         description="Timestamp when instance was parsed"
     )
 
+    # Counts are taken once at construction (and on reassignment of the
+    # underlying field or model_copy(update=...)); in-place appends are not
+    # tracked
+    _n_facts: int = PrivateAttr(default=0)
+    _n_contexts: int = PrivateAttr(default=0)
+    _n_units: int = PrivateAttr(default=0)
+
+    _COUNTED_FIELDS: ClassVar[frozenset] = frozenset({'facts', 'fact_table', 'contexts', 'units'})
+
+    # List of XBRLFact built from fact_table on first get_facts() call
+    _facts_view: Optional[List[XBRLFact]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._recount()
+
+    @field_serializer('facts', mode='wrap')
+    def serialize_facts(self, facts: List[XBRLFact], handler: Any) -> Any:
+        """Dump a columnar instance's facts from fact_table, so no facts are lost."""
+        if self.fact_table is not None:
+            facts = list(self.fact_table.iter_facts())
+        return handler(facts)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self._COUNTED_FIELDS:
+            self._facts_view = None
+            self._recount()
+
+    def model_copy(
+        self,
+        *,
+        update: Optional[Mapping[str, Any]] = None,
+        deep: bool = False
+    ) -> "XBRLInstance":
+        """Copy the instance, recounting when update replaces a counted field."""
+        copy = super().model_copy(update=update, deep=deep)
+        if update and not self._COUNTED_FIELDS.isdisjoint(update):
+            copy._facts_view = None
+            copy._recount()
+        return copy
+
+    def _recount(self) -> None:
+        """Cache the fact, context and unit counts."""
+        if self.fact_table is not None:
+            self._n_facts = len(self.fact_table)
+        else:
+            self._n_facts = len(self.facts)
+        self._n_contexts = len(self.contexts)
+        self._n_units = len(self.units)
+
     @property
     def fact_count(self) -> int:
         """Get total number of facts in this instance."""
-        return len(self.facts)
+        return self._n_facts
 
     @property
     def context_count(self) -> int:
         """Get total number of contexts in this instance."""
-        return len(self.contexts)
+        return self._n_contexts
 
     @property
     def unit_count(self) -> int:
         """Get total number of units in this instance."""
-        return len(self.units)
-
-    model_config = ConfigDict(str_strip_whitespace=True)
+        return self._n_units
+
+    def get_facts(self) -> List[XBRLFact]:
+        """
+        Facts as a list, whichever storage the instance uses.
+        
+        For columnar instances the list is built from fact_table on first
+        call and reused afterwards.
+        """
+        if self.fact_table is None:
+            return self.facts
+        if self._facts_view is None:
+            self._facts_view = list(self.fact_table.iter_facts())
+        return self._facts_view
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Facts as a pyarrow Table, one column per field, for vectorized scans.
+        
+        Columnar instances wrap fact_table without copying; otherwise the
+        table is built from facts.
+        """
+        if self.fact_table is not None:
+            return self.fact_table.to_arrow()
+        return XBRLFactTable.from_facts(self.facts).to_arrow()
+
+    def iter_facts(self) -> Iterator[XBRLFact]:
+        """Iterate over facts, materializing them from fact_table if present."""
+        if self.fact_table is not None:
+            yield from self.fact_table.iter_facts()
+        else:
+            yield from self.facts
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 if __name__ == "__main__":
@@ -1,48 +1,209 @@
 """
-XBRL Parser using Arelle Plugin Model
+XBRL Parser using lxml, with Arelle for validation
 
-This module provides a wrapper around the Arelle XBRL processor to parse,
-validate, and extract data from XBRL instance documents.
+This module parses XBRL instance documents by walking the XML directly with
+lxml, and wraps the Arelle XBRL processor for schema validation (and for
+parsing when full DTS resolution is wanted).
 
 The XBRLParser class handles:
 - Document validation against schema
 - Context extraction (periods, scenarios, dimensions)
 - Unit definition extraction
 - Fact extraction with proper type conversion
+
+Arelle is imported only when a parser first needs it (validation, the
+Arelle parse path, or preload_taxonomy), so lxml-only use never pays its
+import cost.
 """
 
+from __future__ import annotations
+
 import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from datetime import date, datetime
 import json
 
-from arelle import Cntlr, ModelXbrl, ModelDocument
+from lxml import etree
 
 from src.ingestion.models import (
     XBRLContext,
     XBRLUnit,
     XBRLFact,
+    XBRLFactTable,
     XBRLInstance,
     XBRLDimension,
     ContextPeriodType,
+    DimensionMemberType,
     UnitType,
 )
 from src.utils.logger import get_logger
 from src.utils.settings import get_settings
 
+if TYPE_CHECKING:
+    from arelle import ModelXbrl
+
+__all__ = ["XBRLParser", "XBRLParseError"]
+
 logger = get_logger(__name__)
 settings = get_settings()
 
+# arelle.Cntlr, imported on first use (see _load_arelle)
+Cntlr = None
+
+
+def _load_arelle():
+    """Import Arelle's controller module once and return it."""
+    global Cntlr
+    if Cntlr is None:
+        from arelle import Cntlr as arelle_cntlr
+        Cntlr = arelle_cntlr
+    return Cntlr
+
+# XBRL 2.1 / XDT namespaces
+_XBRLI_NS = "http://www.xbrl.org/2003/instance"
+_XBRLDI_NS = "http://xbrl.org/2006/xbrldi"
+_LINK_NS = "http://www.xbrl.org/2003/linkbase"
+_XLINK_NS = "http://www.w3.org/1999/xlink"
+_XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+_ISO4217_NS = "http://www.xbrl.org/2003/iso4217"
+
+# Clark-notation tags and paths used by the lxml walk
+_CONTEXT_TAG = f"{{{_XBRLI_NS}}}context"
+_UNIT_TAG = f"{{{_XBRLI_NS}}}unit"
+_SCHEMA_REF_TAG = f"{{{_LINK_NS}}}schemaRef"
+_IDENTIFIER_PATH = f"{{{_XBRLI_NS}}}entity/{{{_XBRLI_NS}}}identifier"
+_SEGMENT_PATH = f"{{{_XBRLI_NS}}}entity/{{{_XBRLI_NS}}}segment"
+_SCENARIO_TAG = f"{{{_XBRLI_NS}}}scenario"
+_PERIOD_TAG = f"{{{_XBRLI_NS}}}period"
+_START_DATE_TAG = f"{{{_XBRLI_NS}}}startDate"
+_END_DATE_TAG = f"{{{_XBRLI_NS}}}endDate"
+_INSTANT_TAG = f"{{{_XBRLI_NS}}}instant"
+_MEASURE_TAG = f"{{{_XBRLI_NS}}}measure"
+_DIVIDE_TAG = f"{{{_XBRLI_NS}}}divide"
+_NUMERATOR_MEASURE_PATH = f"{{{_XBRLI_NS}}}unitNumerator/{{{_XBRLI_NS}}}measure"
+_DENOMINATOR_MEASURE_PATH = f"{{{_XBRLI_NS}}}unitDenominator/{{{_XBRLI_NS}}}measure"
+_EXPLICIT_MEMBER_TAG = f"{{{_XBRLDI_NS}}}explicitMember"
+_TYPED_MEMBER_TAG = f"{{{_XBRLDI_NS}}}typedMember"
+_XLINK_HREF = f"{{{_XLINK_NS}}}href"
+_XSI_NIL = f"{{{_XSI_NS}}}nil"
+
 
 class XBRLParseError(Exception):
     """Raised when XBRL parsing or validation fails."""
     pass
 
 
+class _DocumentNamespaces:
+    """
+    Namespace lookups for one document, built once from the root's declarations.
+    
+    Created per parse()/iter_facts() call and passed down the lxml walk, so
+    interleaved reads of different documents on one parser (e.g. a
+    partially consumed iter_facts() generator and a parse()) never resolve
+    QNames against each other's prefixes.
+    """
+    
+    __slots__ = ("by_prefix", "by_uri", "qnames")
+    
+    def __init__(self):
+        self.by_prefix: Dict[str, str] = {}
+        self.by_uri: Dict[str, str] = {}
+        # Clark tag -> interned prefixed QName, so facts sharing a concept
+        # share one str
+        self.qnames: Dict[str, str] = {}
+    
+    def load(self, root_nsmap: Dict[Optional[str], str]) -> None:
+        """Fill the prefix->URI and URI->prefix tables from the root's nsmap."""
+        self.by_prefix = {prefix or "": uri for prefix, uri in root_nsmap.items()}
+        self.by_uri = {uri: prefix for prefix, uri in self.by_prefix.items()}
+        self.qnames = {}
+
+
+_UnitSignature = Tuple[UnitType, Optional[str], Optional[str], Optional[str]]
+
+
+_Measure = Tuple[Optional[str], str, str]
+
+
+@lru_cache(maxsize=256)
+def _classify_measures(
+    numerators: Tuple[_Measure, ...],
+    denominators: Optional[Tuple[_Measure, ...]]
+) -> _UnitSignature:
+    """
+    Classify a unit from resolved (uri, local name, text) measures.
+    
+    denominators is None for a plain unit and a tuple for xbrli:divide.
+    Both the lxml and the Arelle paths classify units here, so they agree
+    on every document. A filing has only a handful of distinct units, so
+    results are cached by the measures.
+    
+    Returns:
+        (unit_type, iso_currency_code, numerator_iso_code, denominator_iso_code)
+    """
+    if denominators is None:
+        if len(numerators) != 1:
+            return (UnitType.OTHER if numerators else UnitType.PURE), None, None, None
+        
+        # Single measure (usually currency or share)
+        uri, local, _ = numerators[0]
+        if uri == _ISO4217_NS:
+            return UnitType.MONETARY, local.upper(), None, None
+        if uri == _XBRLI_NS and local == "shares":
+            return UnitType.SHARES, None, None, None
+        if uri == _XBRLI_NS and local == "pure":
+            return UnitType.PURE, None, None, None
+        return UnitType.OTHER, None, None, None
+    
+    # Composite unit (e.g., USD/share)
+    unit_type = UnitType.OTHER
+    numerator = None
+    denominator = None
+    
+    if len(numerators) == 1 and numerators[0][0] == _ISO4217_NS:
+        unit_type = UnitType.MONETARY
+        numerator = numerators[0][1].upper()
+    
+    if (len(denominators) == 1 and denominators[0][0] == _XBRLI_NS
+            and denominators[0][1] == "shares"):
+        unit_type = UnitType.SHARES
+        denominator = denominators[0][2]
+    
+    return unit_type, None, numerator, denominator
+
+
+def _qname_measure(qname) -> _Measure:
+    """Turn an Arelle measure QName into the (uri, local name, text) form."""
+    return qname.namespaceURI, qname.localName, str(qname)
+
+
+# Parser owned by each parse_many worker process (see _init_worker)
+_worker_parser: Optional["XBRLParser"] = None
+
+
+def _init_worker(arelle_log_level: str, use_lxml: bool) -> None:
+    """Build one parser per worker process; Arelle controllers are not fork-safe."""
+    global _worker_parser
+    _worker_parser = XBRLParser(arelle_log_level=arelle_log_level, use_lxml=use_lxml)
+
+
+def _worker_parse(file_path: str, columnar: bool) -> XBRLInstance:
+    """Parse one filing with the worker's parser."""
+    return _worker_parser.parse(file_path, columnar=columnar)
+
+
 class XBRLParser:
     """
-    Parses and extracts data from XBRL instance documents using Arelle.
+    Parses and extracts data from XBRL instance documents.
+    
+    By default instances are read with lxml, which skips Arelle's taxonomy
+    (DTS) loading. Facts read this way carry no concept labels, and a fact
+    is treated as numeric when it has a unitRef. Pass use_lxml=False to
+    parse through Arelle instead; validate() always uses Arelle.
     
     Example:
         >>> parser = XBRLParser()
@@ -50,23 +211,57 @@ class XBRLParser:
         >>> print(f"Facts extracted: {instance.fact_count}")
     """
     
-    def __init__(self, arelle_log_level: str = "WARNING"):
+    def __init__(self, arelle_log_level: str = "WARNING", use_lxml: bool = True):
         """
-        Initialize the XBRL parser with Arelle controller.
+        Initialize the XBRL parser.
+        
+        The Arelle controller is created on first use of self.controller.
         
         Args:
             arelle_log_level: Logging level for Arelle ("DEBUG", "INFO", "WARNING", "ERROR")
+            use_lxml: Parse instances with lxml instead of loading them
+                through Arelle
         """
-        self.controller = Cntlr.Cntlr()
-        self.controller.logHandler.setLevel(getattr(logging, arelle_log_level))
-        logger.info(f"XBRL Parser initialized with Arelle {self.controller.VERSION}")
+        self.use_lxml = use_lxml
+        self._arelle_log_level = arelle_log_level
+        # Checked once (and again per parse) so the per-fact error paths
+        # skip building debug messages when DEBUG is off
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        # Taxonomy DTS kept loaded across filings (see preload_taxonomy)
+        self._taxonomy_model = None
+        
+        # Frozen dimensions shared by the contexts of one document
+        self._dimension_cache: Dict[Tuple[str, str, DimensionMemberType], XBRLDimension] = {}
+        
+        self._controller = None
+        logger.info(f"XBRL Parser initialized ({'lxml' if use_lxml else 'Arelle'} parsing)")
+    
+    @property
+    def controller(self):
+        """Arelle controller, created (and Arelle imported) on first access."""
+        if self._controller is None:
+            cntlr = _load_arelle()
+            self._controller = cntlr.Cntlr()
+            self._controller.logHandler.setLevel(getattr(logging, self._arelle_log_level))
+            logger.info(f"Arelle controller started: {self._controller.VERSION}")
+        return self._controller
     
-    def parse(self, file_path: str) -> XBRLInstance:
+    def parse(
+        self,
+        file_path: str,
+        columnar: bool = False,
+        validate: bool = False
+    ) -> XBRLInstance:
         """
         Parse an XBRL instance document and extract all data.
         
         Args:
             file_path: Path to XBRL instance file (.xml)
+            columnar: Store facts in XBRLInstance.fact_table (pyarrow columns)
+                instead of a list of XBRLFact objects
+            validate: Also validate the document, reusing the same Arelle
+                load (always parses through Arelle). The result is in
+                validation_passed, with every error in validation_errors
             
         Returns:
             XBRLInstance: Parsed document with contexts, units, and facts
@@ -81,6 +276,264 @@ class XBRLParser:
         
         logger.info(f"Parsing XBRL instance: {file_path.name}")
         
+        self._dimension_cache = {}
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        try:
+            if self.use_lxml and not validate:
+                instance = self._parse_lxml(file_path, columnar)
+            else:
+                instance = self._parse_arelle(file_path, columnar, validate)
+            
+            logger.info(
+                f"Successfully parsed: {instance.fact_count} facts, "
+                f"{instance.context_count} contexts, {instance.unit_count} units"
+            )
+            
+            return instance
+            
+        except Exception as e:
+            logger.error(f"XBRL parsing failed: {str(e)}", exc_info=True)
+            raise XBRLParseError(f"Failed to parse XBRL: {str(e)}") from e
+    
+    def parse_many(
+        self,
+        paths: List[str],
+        workers: Optional[int] = None,
+        columnar: bool = False
+    ) -> List[XBRLInstance]:
+        """
+        Parse several independent filings in parallel worker processes.
+        
+        Each worker builds its own XBRLParser with this parser's settings.
+        A single path (or workers=1) is parsed in this process.
+        
+        Args:
+            paths: Paths to XBRL instance files
+            workers: Number of processes (default: CPU count)
+            columnar: Passed through to parse()
+            
+        Returns:
+            Parsed instances, in the same order as paths
+            
+        Raises:
+            XBRLParseError: If any filing fails to parse
+        """
+        paths = [str(p) for p in paths]
+        
+        if workers == 1 or len(paths) <= 1:
+            return [self.parse(p, columnar=columnar) for p in paths]
+        
+        logger.info(f"Parsing {len(paths)} filings with {workers or 'default'} workers")
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self._arelle_log_level, self.use_lxml),
+        ) as executor:
+            return list(executor.map(
+                _worker_parse, paths, [columnar] * len(paths), chunksize=4
+            ))
+    
+    def iter_facts(self, file_path: str) -> Iterator[XBRLFact]:
+        """
+        Stream the facts of an XBRL instance without building the document.
+        
+        Only one fact element is held in memory at a time, so large filings
+        can be ingested in chunks. Contexts and units are skipped; use
+        parse() when they are needed.
+        
+        Args:
+            file_path: Path to XBRL instance file (.xml)
+            
+        Yields:
+            XBRLFact for each fact in document order
+            
+        Raises:
+            XBRLParseError: If file not found or the XML cannot be read
+        """
+        file_path = Path(file_path)
+        
+        if not file_path.exists():
+            raise XBRLParseError(f"XBRL file not found: {file_path}")
+        
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        try:
+            for fields in self._stream_facts(file_path):
+                yield XBRLFact.model_construct(**fields)
+        except etree.LxmlError as e:
+            logger.error(f"XBRL fact streaming failed: {str(e)}")
+            raise XBRLParseError(f"Failed to parse XBRL: {str(e)}") from e
+    
+    def _stream_facts(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield normalized fact fields for each fact element in the file."""
+        ns = _DocumentNamespaces()
+        for elem in self._iter_root_children(file_path, ns):
+            if elem.get("contextRef") is not None:
+                fields = self._extract_element_fact_fields(elem, ns)
+                if fields is not None:
+                    yield fields
+    
+    def _iter_root_children(
+        self,
+        file_path: Path,
+        ns: _DocumentNamespaces
+    ) -> Iterator[etree._Element]:
+        """
+        Incrementally parse a document, yielding each child of the root.
+        
+        Each child is cleared and detached once the consumer moves on, so
+        resident memory stays at one top-level element (a context, unit or
+        fact) regardless of document size. Consumers must not keep
+        references to yielded elements.
+        
+        Args:
+            file_path: Path to the XML document
+            ns: Filled from the root's namespace declarations before the
+                first child is yielded
+        """
+        events = etree.iterparse(
+            str(file_path),
+            events=("start", "end"),
+            huge_tree=True,
+            remove_blank_text=True,
+            remove_comments=True,
+            collect_ids=False,
+        )
+        
+        depth = 0
+        for event, elem in events:
+            if event == "start":
+                if depth == 0:
+                    # Done once per document, so QNames on facts and in
+                    # dimension/measure values are resolved with a dict
+                    # lookup instead of lxml rebuilding an element's
+                    # in-scope nsmap each time
+                    ns.load(elem.nsmap)
+                depth += 1
+                continue
+            
+            depth -= 1
+            if depth != 1:
+                continue
+            
+            yield elem
+            
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+    
+    def _element_qname(self, elem: etree._Element, ns: _DocumentNamespaces) -> str:
+        """Prefixed QName of an element, using the document's prefix for its namespace."""
+        tag = elem.tag
+        qname = ns.qnames.get(tag)
+        if qname is not None:
+            return qname
+        
+        uri, _, local = tag[1:].partition("}")
+        if not local:
+            # No namespace
+            qname = tag
+        else:
+            prefix = ns.by_uri.get(uri)
+            if prefix is None:
+                prefix = elem.prefix
+            qname = f"{prefix}:{local}" if prefix else local
+        
+        qname = ns.qnames[tag] = sys.intern(qname)
+        return qname
+    
+    def _resolve_qname_text(
+        self,
+        text: str,
+        elem: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> Tuple[Optional[str], str]:
+        """
+        Resolve a QName-valued attribute or text to (namespace URI, local name).
+        
+        Prefixes are looked up in the document table; only a prefix declared
+        below the root falls back to the element's own nsmap.
+        """
+        prefix, _, local = text.rpartition(":")
+        uri = ns.by_prefix.get(prefix)
+        if uri is None:
+            uri = elem.nsmap.get(prefix or None)
+        return uri, local
+    
+    def _normalize_qname_text(
+        self,
+        text: Optional[str],
+        elem: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> str:
+        """Rewrite a QName value with the document's prefix for its namespace."""
+        text = (text or "").strip()
+        uri, local = self._resolve_qname_text(text, elem, ns)
+        prefix = ns.by_uri.get(uri) if uri is not None else None
+        if prefix is None:
+            return text
+        return f"{prefix}:{local}" if prefix else local
+    
+    def _parse_lxml(self, file_path: Path, columnar: bool) -> XBRLInstance:
+        """Parse an instance in one streaming lxml pass over the root's children."""
+        # Contexts and units are small and kept; facts are converted as
+        # their element ends so the tree never holds more than one
+        contexts = []
+        units = []
+        fact_fields = []
+        schema_refs = []
+        ns = _DocumentNamespaces()
+        
+        for elem in self._iter_root_children(file_path, ns):
+            tag = elem.tag
+            if tag == _CONTEXT_TAG:
+                context = self._convert_context_element(elem, ns)
+                if context:
+                    contexts.append(context)
+            elif tag == _UNIT_TAG:
+                unit = self._convert_unit_element(elem, ns)
+                if unit:
+                    units.append(unit)
+            elif tag == _SCHEMA_REF_TAG:
+                schema_refs.append(elem.get(_XLINK_HREF))
+            elif elem.get("contextRef") is not None:
+                fields = self._extract_element_fact_fields(elem, ns)
+                if fields is not None:
+                    fact_fields.append(fields)
+        
+        if columnar:
+            facts = []
+            fact_table = self._build_fact_table(fact_fields)
+        else:
+            facts = [XBRLFact.model_construct(**f) for f in fact_fields]
+            fact_table = None
+        
+        logger.debug(
+            f"Extracted {len(contexts)} contexts, {len(units)} units, "
+            f"{len(fact_fields)} facts"
+        )
+        
+        return XBRLInstance(
+            file_path=str(file_path),
+            entity_identifier=contexts[0].entity_identifier if contexts else "UNKNOWN",
+            fiscal_period_focus=self._extract_fiscal_period(None, contexts),
+            contexts=contexts,
+            units=units,
+            facts=facts,
+            fact_table=fact_table,
+            schema_ref=", ".join(r for r in schema_refs[:3] if r) or None,
+            namespace_declaration=dict(ns.by_prefix),
+        )
+    
+    def _parse_arelle(
+        self,
+        file_path: Path,
+        columnar: bool,
+        validate: bool = False
+    ) -> XBRLInstance:
+        """Parse an instance through Arelle's model (loads the full DTS)."""
+        model_xbrl = None
         try:
             # Load document via Arelle
             model_xbrl = self.controller.modelManager.load(str(file_path))
@@ -94,7 +547,12 @@ class XBRLParser:
             # Extract components
             contexts = self._parse_contexts(model_xbrl)
             units = self._parse_units(model_xbrl)
-            facts = self._parse_facts(model_xbrl, contexts)
+            if columnar:
+                facts = []
+                fact_table = self._parse_fact_table(model_xbrl)
+            else:
+                facts = self._parse_facts(model_xbrl)
+                fact_table = None
             
             # Get entity identifier
             entity_id = self._extract_entity_identifier(model_xbrl)
@@ -102,38 +560,34 @@ class XBRLParser:
             # Get fiscal period focus
             fiscal_period = self._extract_fiscal_period(model_xbrl, contexts)
             
+            errors = model_xbrl.errors if validate else model_xbrl.errors[:10]  # First 10
+            
             # Create instance
-            instance = XBRLInstance(
+            return XBRLInstance(
                 file_path=str(file_path),
                 entity_identifier=entity_id,
                 fiscal_period_focus=fiscal_period,
                 contexts=contexts,
                 units=units,
                 facts=facts,
+                fact_table=fact_table,
                 schema_ref=self._extract_schema_reference(model_xbrl),
                 namespace_declaration=self._extract_namespaces(model_xbrl),
-                validation_errors=[str(e) for e in model_xbrl.errors[:10]],  # First 10
-            )
-            
-            logger.info(
-                f"Successfully parsed: {instance.fact_count} facts, "
-                f"{instance.context_count} contexts, {instance.unit_count} units"
+                validation_errors=[str(e) for e in errors],
+                validation_passed=not model_xbrl.errors if validate else None,
             )
             
-            return instance
-            
-        except Exception as e:
-            logger.error(f"XBRL parsing failed: {str(e)}", exc_info=True)
-            raise XBRLParseError(f"Failed to parse XBRL: {str(e)}") from e
         finally:
-            # Clean up Arelle model
-            if model_xbrl:
-                self.controller.modelManager.remove(model_xbrl)
+            # Clean up the instance model; a preloaded taxonomy stays cached
+            if model_xbrl and model_xbrl is not self._taxonomy_model:
+                self.controller.modelManager.close(model_xbrl)
     
     def validate(self, file_path: str) -> Tuple[bool, List[str]]:
         """
         Validate an XBRL instance against its schema.
         
+        Use parse(validate=True) to validate and parse with one load.
+        
         Args:
             file_path: Path to XBRL instance file
             
@@ -148,24 +602,42 @@ class XBRLParser:
         logger.info(f"Validating XBRL: {file_path.name}")
         
         try:
-            model_xbrl = self.controller.modelManager.load(str(file_path))
-            
-            if not model_xbrl:
-                return False, ["Failed to load model"]
-            
-            is_valid = len(model_xbrl.errors) == 0
-            errors = [str(e) for e in model_xbrl.errors]
-            
-            logger.info(f"Validation result: {'PASS' if is_valid else 'FAIL'}")
-            
-            return is_valid, errors
-            
-        except Exception as e:
+            instance = self.parse(str(file_path), validate=True)
+        except XBRLParseError as e:
             logger.error(f"Validation error: {str(e)}")
             return False, [str(e)]
-        finally:
-            if model_xbrl:
-                self.controller.modelManager.remove(model_xbrl)
+        
+        logger.info(f"Validation result: {'PASS' if instance.validation_passed else 'FAIL'}")
+        
+        return instance.validation_passed, instance.validation_errors
+    
+    def preload_taxonomy(self, taxonomy_url: str) -> None:
+        """
+        Load a taxonomy once and keep it pinned for later Arelle loads.
+        
+        Filings that share the taxonomy then resolve it from Arelle's
+        in-memory DTS cache instead of reloading it per instance. Only
+        affects the Arelle paths (validate, and parse with use_lxml=False).
+        
+        Args:
+            taxonomy_url: URL or path of the taxonomy entry point
+            
+        Raises:
+            XBRLParseError: If the taxonomy cannot be loaded
+        """
+        if self._taxonomy_model is None:
+            self.controller.modelManager.disclosureSystem.select("efm-pragmatic")
+        else:
+            self.controller.modelManager.close(self._taxonomy_model)
+            self._taxonomy_model = None
+        
+        logger.info(f"Preloading taxonomy: {taxonomy_url}")
+        
+        model_xbrl = self.controller.modelManager.load(taxonomy_url)
+        if not model_xbrl:
+            raise XBRLParseError(f"Failed to load taxonomy: {taxonomy_url}")
+        
+        self._taxonomy_model = model_xbrl
     
     def _parse_contexts(self, model_xbrl: ModelXbrl) -> List[XBRLContext]:
         """Extract all contexts from XBRL model."""
@@ -199,23 +671,19 @@ class XBRLParser:
         logger.debug(f"Extracted {len(units)} units")
         return units
     
-    def _parse_facts(
-        self,
-        model_xbrl: ModelXbrl,
-        contexts: List[XBRLContext]
-    ) -> List[XBRLFact]:
+    def _parse_facts(self, model_xbrl: ModelXbrl) -> List[XBRLFact]:
         """Extract all facts from XBRL model."""
         facts = []
-        context_map = {c.context_id: c for c in contexts}
         
         try:
             for fact in model_xbrl.facts:
                 try:
-                    xbrl_fact = self._convert_fact(fact, context_map)
+                    xbrl_fact = self._convert_fact(fact)
                     if xbrl_fact:
                         facts.append(xbrl_fact)
                 except Exception as e:
-                    logger.debug(f"Error parsing individual fact: {str(e)}")
+                    if self._debug:
+                        logger.debug("Error parsing individual fact: %s", e)
                     continue
                     
         except Exception as e:
@@ -224,6 +692,34 @@ class XBRLParser:
         logger.debug(f"Extracted {len(facts)} facts")
         return facts
     
+    def _parse_fact_table(self, model_xbrl: ModelXbrl) -> XBRLFactTable:
+        """Extract all facts from XBRL model into columnar storage."""
+        return self._build_fact_table(
+            self._extract_fact_fields(fact) for fact in model_xbrl.facts
+        )
+    
+    def _build_fact_table(
+        self,
+        fact_fields: Iterable[Optional[Dict[str, Any]]]
+    ) -> XBRLFactTable:
+        """Collect normalized fact fields (None entries skipped) into columns."""
+        columns = {name: [] for name in XBRLFactTable.COLUMNS}
+        
+        try:
+            for fields in fact_fields:
+                if fields is None:
+                    continue
+                
+                for name, column in columns.items():
+                    column.append(fields[name])
+                    
+        except Exception as e:
+            logger.warning(f"Error parsing facts: {str(e)}")
+        
+        fact_table = XBRLFactTable.from_pylists(columns)
+        logger.debug(f"Extracted {len(fact_table)} facts into fact table")
+        return fact_table
+    
     def _convert_context(self, context_id: str, context_elem) -> Optional[XBRLContext]:
         """Convert Arelle context element to XBRLContext model."""
         try:
@@ -232,39 +728,40 @@ class XBRLParser:
             period_start = None
             period_end = None
             
-            if hasattr(context_elem, 'period'):
-                period = context_elem.period
-                
-                if hasattr(period, 'startDate'):
+            period = getattr(context_elem, 'period', None)
+            if period is not None:
+                period_start = getattr(period, 'startDate', None)
+                if period_start is not None:
                     period_type = ContextPeriodType.DURATION
-                    period_start = period.startDate
                 
-                if hasattr(period, 'endDate'):
-                    period_end = period.endDate
+                period_end = getattr(period, 'endDate', None)
             
             # Extract dimensions from segment and scenario
             segment_dims = []
             scenario_dims = []
             
-            if hasattr(context_elem, 'segMember'):
-                segment_dims = self._extract_dimensions(context_elem.segMember)
+            seg_members = getattr(context_elem, 'segMember', None)
+            if seg_members is not None:
+                segment_dims = self._extract_dimensions(seg_members)
             
-            if hasattr(context_elem, 'scenarioMember'):
-                scenario_dims = self._extract_dimensions(context_elem.scenarioMember)
+            scenario_members = getattr(context_elem, 'scenarioMember', None)
+            if scenario_members is not None:
+                scenario_dims = self._extract_dimensions(scenario_members)
             
             # Get entity identifier
             entity_id = ""
-            if hasattr(context_elem, 'entityIdentifier'):
-                entity_id = context_elem.entityIdentifier[1]
+            entity_identifier = getattr(context_elem, 'entityIdentifier', None)
+            if entity_identifier is not None:
+                entity_id = entity_identifier[1].strip()
             
             return XBRLContext(
-                context_id=context_id,
+                context_id=context_id.strip(),
                 entity_identifier=entity_id,
                 period_type=period_type,
                 period_start=period_start,
                 period_end=period_end,
-                segment_dimensions=segment_dims,
-                scenario_dimensions=scenario_dims,
+                segment_dimensions=segment_dims or None,
+                scenario_dimensions=scenario_dims or None,
             )
             
         except Exception as e:
@@ -278,57 +775,52 @@ class XBRLParser:
         try:
             for dim_name, member_name in member_dict.items():
                 dimensions.append(
-                    XBRLDimension(
-                        dimension_name=str(dim_name),
-                        member_name=str(member_name),
+                    self._shared_dimension(
+                        str(dim_name), str(member_name), DimensionMemberType.EXPLICIT
                     )
                 )
         except Exception as e:
-            logger.debug(f"Error extracting dimensions: {str(e)}")
+            if self._debug:
+                logger.debug("Error extracting dimensions: %s", e)
         
         return dimensions
     
+    def _shared_dimension(
+        self,
+        dimension_name: str,
+        member_name: str,
+        member_type: DimensionMemberType
+    ) -> XBRLDimension:
+        """
+        Return the document's XBRLDimension for a dimension/member pair.
+        
+        Many contexts repeat the same few members, and XBRLDimension is
+        frozen, so each distinct member is built once and shared.
+        """
+        key = (dimension_name, member_name, member_type)
+        dimension = self._dimension_cache.get(key)
+        if dimension is None:
+            dimension = self._dimension_cache[key] = XBRLDimension(
+                dimension_name=dimension_name,
+                member_name=member_name,
+                member_type=member_type,
+            )
+        return dimension
+    
     def _convert_unit(self, unit_id: str, unit_elem) -> Optional[XBRLUnit]:
         """Convert Arelle unit element to XBRLUnit model."""
         try:
-            unit_type = UnitType.PURE
-            iso_code = None
-            numerator = None
-            denominator = None
-            
-            # Check if monetary
-            if hasattr(unit_elem, 'measures'):
-                measures = unit_elem.measures
-                
-                if measures and len(measures) == 1:
-                    # Single measure (usually currency or share)
-                    measure = measures[0]
-                    measure_str = str(measure)
-                    
-                    # Detect currency
-                    if measure_str.startswith("iso4217:"):
-                        unit_type = UnitType.MONETARY
-                        iso_code = measure_str.replace("iso4217:", "").upper()
-                    elif "xbrli:shares" in measure_str.lower():
-                        unit_type = UnitType.SHARES
-                    else:
-                        unit_type = UnitType.OTHER
-                
-                elif measures and len(measures) == 2:
-                    # Composite unit (e.g., USD/share)
-                    numerator_str = str(measures[0])
-                    denominator_str = str(measures[1])
-                    
-                    if "iso4217:" in numerator_str.lower():
-                        unit_type = UnitType.MONETARY
-                        numerator = numerator_str.replace("iso4217:", "").upper()
-                    
-                    if "xbrli:shares" in denominator_str.lower():
-                        unit_type = UnitType.SHARES
-                        denominator = denominator_str
+            # Arelle's measures are a (numerators, denominators) pair of
+            # QName sequences; an empty denominator side means no xbrli:divide
+            numerator_qnames, denominator_qnames = getattr(unit_elem, 'measures', None) or ((), ())
+            denominators = tuple(_qname_measure(q) for q in denominator_qnames)
+            unit_type, iso_code, numerator, denominator = _classify_measures(
+                tuple(_qname_measure(q) for q in numerator_qnames),
+                denominators or None,
+            )
             
             return XBRLUnit(
-                unit_id=unit_id,
+                unit_id=unit_id.strip(),
                 unit_type=unit_type,
                 iso_currency_code=iso_code,
                 numerator_iso_code=numerator,
@@ -339,19 +831,31 @@ class XBRLParser:
             logger.debug(f"Failed to convert unit {unit_id}: {str(e)}")
             return None
     
-    def _convert_fact(
-        self,
-        fact_elem,
-        context_map: Dict[str, XBRLContext]
-    ) -> Optional[XBRLFact]:
+    def _convert_fact(self, fact_elem) -> Optional[XBRLFact]:
         """Convert Arelle fact element to XBRLFact model."""
+        fields = self._extract_fact_fields(fact_elem)
+        if fields is None:
+            return None
+        
+        # Facts are the bulk of an instance, so build them without
+        # validation from values normalized here (see XBRLFact)
+        return XBRLFact.model_construct(**fields)
+    
+    def _extract_fact_fields(self, fact_elem) -> Optional[Dict[str, Any]]:
+        """
+        Read the normalized XBRLFact field values from an Arelle fact element.
+        
+        Shared by the object and columnar fact paths. Returns None for facts
+        without a context or that cannot be read.
+        """
         try:
             context_ref = getattr(fact_elem, 'contextID', None)
             if not context_ref:
                 return None
             
             # Get concept QName
-            concept_qname = str(fact_elem.qname) if hasattr(fact_elem, 'qname') else ""
+            qname = getattr(fact_elem, 'qname', None)
+            concept_qname = sys.intern(str(qname)) if qname is not None else ""
             concept_label = getattr(fact_elem, 'label', None)
             
             # Get value
@@ -368,38 +872,254 @@ class XBRLParser:
             
             # Get value type from concept
             value_type = "nonNumeric"
-            if hasattr(fact_elem, 'concept') and fact_elem.concept:
-                if hasattr(fact_elem.concept, 'baseXsdType'):
-                    base_type = fact_elem.concept.baseXsdType
-                    if base_type and 'double' in base_type.lower():
-                        value_type = "numeric"
-            
-            return XBRLFact(
-                concept_qname=concept_qname,
-                concept_label=concept_label,
-                value=value,
-                value_type=value_type,
-                context_ref=context_ref,
-                unit_ref=unit_ref,
-                decimals=decimals,
-                is_nil=is_nil,
+            concept = getattr(fact_elem, 'concept', None)
+            if concept:
+                base_type = getattr(concept, 'baseXsdType', None)
+                if base_type and 'double' in base_type.lower():
+                    value_type = "numeric"
+            
+            return {
+                "concept_qname": concept_qname,
+                "concept_label": concept_label,
+                "value": value.strip() if isinstance(value, str) else value,
+                "value_type": value_type,
+                "context_ref": sys.intern(context_ref.strip()),
+                "unit_ref": sys.intern(unit_ref.strip()) if unit_ref else None,
+                "decimals": self._parse_decimals(decimals),
+                "is_nil": bool(is_nil),
+            }
+            
+        except Exception as e:
+            if self._debug:
+                logger.debug("Failed to convert fact: %s", e)
+            return None
+    
+    @staticmethod
+    def _parse_decimals(decimals: Optional[str]) -> Optional[int]:
+        """
+        Convert an XBRL decimals attribute to int.
+        
+        Returns None when absent or 'INF' (exact value, no rounding).
+        """
+        if decimals is None:
+            return None
+        
+        decimals = str(decimals).strip()
+        if not decimals or decimals == "INF":
+            return None
+        
+        return int(decimals)
+    
+    def _convert_context_element(
+        self,
+        elem: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> Optional[XBRLContext]:
+        """Convert an xbrli:context element to XBRLContext model."""
+        context_id = (elem.get("id") or "").strip()
+        
+        try:
+            identifier = elem.find(_IDENTIFIER_PATH)
+            entity_id = ""
+            entity_scheme = None
+            if identifier is not None:
+                entity_id = (identifier.text or "").strip()
+                entity_scheme = identifier.get("scheme")
+            
+            # Duration periods have startDate/endDate, instants a single
+            # instant; 'forever' is a duration without dates
+            period_type = ContextPeriodType.INSTANT
+            period_start = None
+            period_end = None
+            
+            period = elem.find(_PERIOD_TAG)
+            if period is not None:
+                start = period.findtext(_START_DATE_TAG)
+                if start is not None:
+                    period_type = ContextPeriodType.DURATION
+                    period_start = self._parse_xbrl_date(start)
+                    period_end = self._parse_xbrl_date(period.findtext(_END_DATE_TAG))
+                else:
+                    instant = period.findtext(_INSTANT_TAG)
+                    if instant is not None:
+                        period_end = self._parse_xbrl_date(instant)
+                    else:
+                        period_type = ContextPeriodType.DURATION
+            
+            segment_dims = self._extract_member_dimensions(elem.find(_SEGMENT_PATH), ns)
+            scenario_dims = self._extract_member_dimensions(elem.find(_SCENARIO_TAG), ns)
+            
+            context_fields = {}
+            if entity_scheme:
+                context_fields["entity_scheme"] = entity_scheme.strip()
+            
+            return XBRLContext(
+                context_id=context_id,
+                entity_identifier=entity_id,
+                period_type=period_type,
+                period_start=period_start,
+                period_end=period_end,
+                segment_dimensions=segment_dims or None,
+                scenario_dimensions=scenario_dims or None,
+                **context_fields,
+            )
+            
+        except Exception as e:
+            logger.debug(f"Failed to convert context {context_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _parse_xbrl_date(text: Optional[str]) -> Optional[date]:
+        """Parse an XBRL date or dateTime string, keeping the date part."""
+        if text is None:
+            return None
+        
+        text = text.strip()
+        if not text:
+            return None
+        
+        return date.fromisoformat(text[:10])
+    
+    def _extract_member_dimensions(
+        self,
+        container: Optional[etree._Element],
+        ns: _DocumentNamespaces
+    ) -> List[XBRLDimension]:
+        """Extract xbrldi explicit/typed members from a segment or scenario."""
+        dimensions = []
+        if container is None:
+            return dimensions
+        
+        for member in container.iterchildren(_EXPLICIT_MEMBER_TAG, _TYPED_MEMBER_TAG):
+            try:
+                if member.tag == _EXPLICIT_MEMBER_TAG:
+                    member_name = self._normalize_qname_text(member.text, member, ns)
+                    member_type = DimensionMemberType.EXPLICIT
+                else:
+                    # A typed member's value is its single child element
+                    value = next(member.iterchildren(tag=etree.Element), None)
+                    member_name = (value.text or "").strip() if value is not None else ""
+                    member_type = DimensionMemberType.TYPED
+                
+                dimensions.append(
+                    self._shared_dimension(
+                        self._normalize_qname_text(member.get("dimension"), member, ns),
+                        member_name,
+                        member_type,
+                    )
+                )
+            except Exception as e:
+                if self._debug:
+                    logger.debug("Error extracting dimensions: %s", e)
+        
+        return dimensions
+    
+    def _convert_unit_element(
+        self,
+        elem: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> Optional[XBRLUnit]:
+        """Convert an xbrli:unit element to XBRLUnit model."""
+        unit_id = (elem.get("id") or "").strip()
+        
+        try:
+            divide = elem.find(_DIVIDE_TAG)
+            if divide is None:
+                numerators = tuple(self._resolve_measure(m, ns) for m in elem.iterfind(_MEASURE_TAG))
+                denominators = None
+            else:
+                numerators = tuple(
+                    self._resolve_measure(m, ns) for m in divide.iterfind(_NUMERATOR_MEASURE_PATH)
+                )
+                denominators = tuple(
+                    self._resolve_measure(m, ns) for m in divide.iterfind(_DENOMINATOR_MEASURE_PATH)
+                )
+            
+            unit_type, iso_code, numerator, denominator = _classify_measures(
+                numerators, denominators
+            )
+            
+            return XBRLUnit(
+                unit_id=unit_id,
+                unit_type=unit_type,
+                iso_currency_code=iso_code,
+                numerator_iso_code=numerator,
+                denominator_iso_code=denominator,
             )
             
         except Exception as e:
-            logger.debug(f"Failed to convert fact: {str(e)}")
+            logger.debug(f"Failed to convert unit {unit_id}: {str(e)}")
+            return None
+    
+    def _resolve_measure(
+        self,
+        measure: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> _Measure:
+        """
+        Resolve an xbrli:measure QName against the document's namespaces.
+        
+        Returns (namespace URI, local name, measure text as written).
+        """
+        text = (measure.text or "").strip()
+        uri, local = self._resolve_qname_text(text, measure, ns)
+        return uri, local, text
+    
+    def _extract_element_fact_fields(
+        self,
+        elem: etree._Element,
+        ns: _DocumentNamespaces
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read the normalized XBRLFact field values from a fact element.
+        
+        lxml counterpart of _extract_fact_fields. Without the taxonomy there
+        is no concept label or type, so facts with a unitRef (which XBRL
+        requires of numeric items) are reported as numeric.
+        """
+        try:
+            context_ref = elem.get("contextRef")
+            if not context_ref:
+                return None
+            
+            concept_qname = self._element_qname(elem, ns)
+            
+            unit_ref = elem.get("unitRef")
+            is_nil = elem.get(_XSI_NIL) in ("true", "1")
+            
+            value = None
+            if not is_nil:
+                # Text blocks may hold XHTML children; take all their text
+                value = elem.text if len(elem) == 0 else "".join(elem.itertext())
+                value = (value or "").strip()
+            
+            return {
+                "concept_qname": concept_qname,
+                "concept_label": None,
+                "value": value,
+                "value_type": "numeric" if unit_ref else "nonNumeric",
+                "context_ref": sys.intern(context_ref.strip()),
+                "unit_ref": sys.intern(unit_ref.strip()) if unit_ref else None,
+                "decimals": self._parse_decimals(elem.get("decimals")),
+                "is_nil": is_nil,
+            }
+            
+        except Exception as e:
+            if self._debug:
+                logger.debug("Failed to convert fact: %s", e)
             return None
     
     def _extract_entity_identifier(self, model_xbrl: ModelXbrl) -> str:
         """Extract entity identifier from document properties."""
         try:
             if hasattr(model_xbrl, 'entityIdentifier'):
-                return model_xbrl.entityIdentifier[1]
+                return model_xbrl.entityIdentifier[1].strip()
             
             # Fallback: try first context
             if model_xbrl.contexts:
                 for context in model_xbrl.contexts.values():
                     if hasattr(context, 'entityIdentifier'):
-                        return context.entityIdentifier[1]
+                        return context.entityIdentifier[1].strip()
         except Exception:
             pass
         
@@ -410,23 +1130,30 @@ class XBRLParser:
         model_xbrl: ModelXbrl,
         contexts: List[XBRLContext]
     ) -> Optional[str]:
-        """Extract fiscal period focus from contexts."""
+        """
+        Extract fiscal period focus from contexts.
+        
+        Prefers the first instant context with a period end whose id
+        contains 'instant' (any case), else the first instant context.
+        """
+        instant = ContextPeriodType.INSTANT
+        first_instant = None
+        
         try:
-            # Look for instant (period-end) contexts
+            # One pass: stop at the first match, remembering the fallback
             for context in contexts:
-                if (context.period_type == ContextPeriodType.INSTANT and
-                    context.period_end and
-                    'INSTANT' in context.context_id.upper()):
-                    return context.context_id
-            
-            # Fallback to first instant context
-            for context in contexts:
-                if context.period_type == ContextPeriodType.INSTANT:
+                if context.period_type != instant:
+                    continue
+                
+                if first_instant is None:
+                    first_instant = context.context_id
+                
+                if context.period_end and 'instant' in context.context_id.casefold():
                     return context.context_id
         except Exception:
             pass
         
-        return None
+        return first_instant
     
     def _extract_schema_reference(self, model_xbrl: ModelXbrl) -> Optional[str]:
         """Extract schema reference from instance document."""
@@ -467,8 +1194,15 @@ class XBRLParser:
     
     def close(self):
         """Close and cleanup Arelle controller."""
+        if self._controller is None:
+            return
+        
         try:
-            self.controller.close()
+            if self._taxonomy_model:
+                self._controller.modelManager.close(self._taxonomy_model)
+                self._taxonomy_model = None
+            self._controller.close()
+            self._controller = None
             logger.info("XBRL Parser closed")
         except Exception as e:
             logger.error(f"Error closing parser: {str(e)}")
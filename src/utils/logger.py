@@ -1,40 +1,105 @@
 import logging
 import json
+import time
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding
+    orjson = None
+
 from src.utils.settings import settings
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
 # -------------------------------------------------------------------
 # JSON Log Formatter
 # -------------------------------------------------------------------
 
 class JsonFormatter(logging.Formatter):
-    def format(self, record: logging.LogRecord) -> str:
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Fields that are the same on every record, serialized once as the
+        # closing part of each object: ,"environment":...}
+        self._static_json_tail = b"," + _dumps({
+            "environment": settings.environment,
+            "project": settings.project_name,
+            "python_version": settings.python_version,
+        })[1:]
+        # (second, text) of the last formatted whole second, reused by
+        # records in the same second. One tuple, replaced in a single
+        # assignment, so threads formatting concurrently never pair one
+        # second with another's text
+        self._last_second = (None, "")
+
+    def _format_timestamp(self, created: float) -> str:
+        """UTC ISO-8601 timestamp (microseconds) from LogRecord.created."""
+        second = int(created)
+        cached_second, text = self._last_second
+        if second != cached_second:
+            text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._last_second = (second, text)
+        return f"{text}.{int((created - second) * 1_000_000):06d}"
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a record as UTF-8 encoded JSON."""
         log_record: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "module": record.module,
             "function": record.funcName,
             "message": record.getMessage(),
-            "environment": settings.environment,
-            "project": settings.project_name,
-            "python_version": settings.python_version,
         }
 
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_record)
+        return _dumps(log_record)[:-1] + self._static_json_tail
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.format_bytes(record).decode("utf-8")
+
+
+class JsonStreamHandler(logging.StreamHandler):
+    """
+    Console handler that writes JsonFormatter output as bytes.
+    
+    Writing to the stream's binary buffer skips decoding the formatter's
+    bytes to str only for the text stream to encode them again. Streams
+    without a buffer (e.g. captured output in tests) use the regular
+    text path.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = getattr(self.stream, "buffer", None)
+        if buffer is None or not isinstance(self.formatter, JsonFormatter):
+            super().emit(record)
+            return
+
+        try:
+            # Flush text already written through the stream first, so it
+            # stays ahead of this record in the output
+            self.stream.flush()
+            buffer.write(self.formatter.format_bytes(record) + self.terminator.encode())
+            buffer.flush()
+        except Exception:
+            self.handleError(record)
 
 
 # -------------------------------------------------------------------
 # Logger Factory
 # -------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
@@ -45,7 +110,7 @@ def get_logger(name: str) -> logging.Logger:
     formatter = JsonFormatter()
 
     # Console Handler
-    console_handler = logging.StreamHandler()
+    console_handler = JsonStreamHandler()
     console_handler.setFormatter(formatter)
 
     # File Handler with Rotation
@@ -1,7 +1,8 @@
 from pathlib import Path
+from dataclasses import dataclass, field
 from datetime import datetime
-from pydantic import Field, field_validator, ConfigDict
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Dict, Mapping
 from dotenv import load_dotenv
 import os
 import sys
@@ -13,83 +14,173 @@ import sys
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 ENV_PATH = PROJECT_ROOT / ".env"
 
-if not ENV_PATH.exists():
-    raise FileNotFoundError(f".env file not found at expected location: {ENV_PATH}")
+# Set to "1" to skip reading .env entirely (e.g. tests with a prepared env)
+SKIP_ENV_VAR = "IND_FIN_XBRL_SKIP_ENV"
 
-load_dotenv(dotenv_path=ENV_PATH)
+
+@lru_cache(maxsize=8)
+def _load_env_file(mtime: float) -> None:
+    """Read .env once per modification time."""
+    load_dotenv(dotenv_path=ENV_PATH)
+
+
+def load_env() -> None:
+    """
+    Load the project .env into os.environ.
+
+    Repeat calls are free until the file changes. Variables already set in
+    the environment are not overridden.
+    """
+    if os.getenv(SKIP_ENV_VAR) == "1":
+        return
+
+    try:
+        mtime = ENV_PATH.stat().st_mtime
+    except OSError:
+        raise FileNotFoundError(f".env file not found at expected location: {ENV_PATH}") from None
+
+    _load_env_file(mtime)
+
+
+load_env()
 
 
 # -------------------------------------------------------------------
 # Settings Schema
 # -------------------------------------------------------------------
 
-class Settings(BaseSettings):
+ALLOWED_ENVIRONMENTS = frozenset({"development", "staging", "production"})
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off", ""})
+
+
+def _lower_environ() -> Dict[str, str]:
+    """
+    The environment keyed by lower-cased variable name.
+
+    Settings names are matched case-insensitively (neo4j_uri and NEO4J_URI
+    both set neo4j_uri), as they were when settings came from pydantic.
+    """
+    return {key.lower(): value for key, value in os.environ.items()}
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    """Read a boolean environment variable (true/false, 1/0, yes/no, on/off)."""
+    value = environ.get(name)
+    if value is None:
+        return default
+
+    value = value.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{name} must be a boolean, got {value!r}")
+
+
+def _env_path(environ: Mapping[str, str], name: str, default: Path) -> Path:
+    """Read a path environment variable."""
+    value = environ.get(name)
+    return Path(value) if value else default
+
+
+# Settings are read once at startup and then only looked up, so they are a
+# frozen slotted dataclass: attribute access is a plain slot read
+@dataclass(frozen=True, slots=True)
+class Settings:
     # ---------------------------------------------------------------
     # Core Metadata
     # ---------------------------------------------------------------
 
-    project_name: str = Field(default="Ind_Fin_XBRL")
-    environment: str = Field(default="development")
-    
+    project_name: str = "Ind_Fin_XBRL"
+    environment: str = "development"
+
     # ---------------------------------------------------------------
     # Root Paths
     # ---------------------------------------------------------------
-    
-    root_path: Path = Field(default=PROJECT_ROOT)
-    data_path: Path = Field(default=PROJECT_ROOT / "data")
+
+    root_path: Path = PROJECT_ROOT
+    data_path: Path = PROJECT_ROOT / "data"
 
     # ---------------------------------------------------------------
     # Data Paths
     # ---------------------------------------------------------------
 
-    raw_data_path: Path = Field(default=PROJECT_ROOT / "data" / "raw")
-    processed_data_path: Path = Field(default=PROJECT_ROOT / "data" / "processed")
-    taxonomy_path: Path = Field(default=PROJECT_ROOT / "data" / "taxonomy")
-    artifacts_path: Path = Field(default=PROJECT_ROOT / "data" / "artifacts")
-    logs_path: Path = Field(default=PROJECT_ROOT / "logs")
+    raw_data_path: Path = PROJECT_ROOT / "data" / "raw"
+    processed_data_path: Path = PROJECT_ROOT / "data" / "processed"
+    taxonomy_path: Path = PROJECT_ROOT / "data" / "taxonomy"
+    artifacts_path: Path = PROJECT_ROOT / "data" / "artifacts"
+    logs_path: Path = PROJECT_ROOT / "logs"
 
     # ---------------------------------------------------------------
     # Neo4j Configuration
     # ---------------------------------------------------------------
 
-    neo4j_uri: str = Field(default="bolt://localhost:7687", validation_alias="NEO4J_URI")
-    neo4j_user: str = Field(default="neo4j", validation_alias="NEO4J_USER")
-    neo4j_password: str = Field(default="password", validation_alias="NEO4J_PASSWORD")
+    neo4j_uri: str = "bolt://localhost:7687"
+    neo4j_user: str = "neo4j"
+    neo4j_password: str = "password"
 
     # ---------------------------------------------------------------
     # Runtime Metadata (Deterministic Capture)
     # ---------------------------------------------------------------
 
-    processing_timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
-    python_version: str = Field(default_factory=lambda: sys.version)
+    processing_timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    python_version: str = field(default_factory=lambda: sys.version)
 
     # ---------------------------------------------------------------
+    # Diagnostics
+    # ---------------------------------------------------------------
+
+    # Stamp every context/unit/fact with its own created_at (costly on
+    # large filings); XBRLInstance.created_at is always set
+    debug_provenance: bool = False
+
     # ---------------------------------------------------------------
     # Validation
     # ---------------------------------------------------------------
 
-    @field_validator("environment")
-    @classmethod
-    def validate_environment(cls, v):
-        allowed = {"development", "staging", "production"}
-        if v not in allowed:
-            raise ValueError(f"environment must be one of {allowed}")
-        return v
+    def __post_init__(self):
+        if self.environment not in ALLOWED_ENVIRONMENTS:
+            raise ValueError(f"environment must be one of {set(ALLOWED_ENVIRONMENTS)}")
 
-    model_config = ConfigDict(
-        env_file=str(ENV_PATH),
-        case_sensitive=False,
-        extra="ignore"
-    )
+    # ---------------------------------------------------------------
+    # Loading
+    # ---------------------------------------------------------------
+
+    @classmethod
+    def _load(cls) -> "Settings":
+        """Build settings from the environment, loading .env first."""
+        load_env()
+        environ = _lower_environ()
+        env = environ.get
+        defaults = cls()
+
+        return cls(
+            project_name=env("project_name", defaults.project_name),
+            environment=env("environment", defaults.environment),
+            root_path=_env_path(environ, "root_path", defaults.root_path),
+            data_path=_env_path(environ, "data_path", defaults.data_path),
+            raw_data_path=_env_path(environ, "raw_data_path", defaults.raw_data_path),
+            processed_data_path=_env_path(environ, "processed_data_path", defaults.processed_data_path),
+            taxonomy_path=_env_path(environ, "taxonomy_path", defaults.taxonomy_path),
+            artifacts_path=_env_path(environ, "artifacts_path", defaults.artifacts_path),
+            logs_path=_env_path(environ, "logs_path", defaults.logs_path),
+            neo4j_uri=env("neo4j_uri", defaults.neo4j_uri),
+            neo4j_user=env("neo4j_user", defaults.neo4j_user),
+            neo4j_password=env("neo4j_password", defaults.neo4j_password),
+            debug_provenance=_env_bool(environ, "debug_provenance", defaults.debug_provenance),
+        )
 
 
 # -------------------------------------------------------------------
 # Singleton Instance
 # -------------------------------------------------------------------
 
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get the settings singleton instance."""
-    return settings
+    return Settings._load()
+
+
+settings = get_settings()
@@ -8,31 +8,71 @@ Tests for:
 - Full ingestion pipeline
 """
 
+import dataclasses
+import io
+import logging
 import unittest
 from pathlib import Path
 from datetime import date, datetime
-from unittest.mock import Mock, patch, MagicMock
+from decimal import Decimal
+from unittest.mock import Mock, patch, MagicMock, seal
 import json
 import tempfile
+import tracemalloc
+import os
+import shutil
 import sys
+from types import SimpleNamespace
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
+import pyarrow as pa
+from lxml import etree
+from pydantic import ValidationError
+
+# Make the project root importable; skipped when it is already on sys.path
+# (pytest from the root, or a forked run_tests worker)
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from src.ingestion.models import (
-    XBRLContext, XBRLUnit, XBRLFact, XBRLInstance,
+    XBRLContext, XBRLUnit, XBRLFact, XBRLFactTable, XBRLInstance,
     XBRLDimension, ContextPeriodType, UnitType, DimensionMemberType
 )
 from src.ingestion.file_handler import (
-    XBRLFileHandler, XBRLFileType, FileNotFoundError as CustomFileNotFoundError
+    XBRLFileHandler, XBRLFileType, FileNotFoundError as CustomFileNotFoundError,
+    _IoUringValidator, _IO_URING_AVAILABLE, _WELL_FORMED_CHUNK, _resolve_cached
 )
-from src.ingestion.xbrl_parser import XBRLParser, XBRLParseError
-from src.utils.logger import get_logger
+from src.ingestion.xbrl_parser import XBRLParser, XBRLParseError, _classify_measures
+from src.utils.logger import JsonFormatter, JsonStreamHandler, get_logger
 from src.utils.settings import get_settings
 
 logger = get_logger(__name__)
 
 
+# Canonical model inputs shared by the tests. Contexts, units and facts are
+# frozen, so tests reuse these and derive variants with model_copy(update=...)
+_STD_CONTEXT = XBRLContext(
+    context_id="FY2024Q4",
+    entity_identifier="0001018724",
+    period_type=ContextPeriodType.INSTANT,
+    period_end=date(2024, 12, 31)
+)
+_STD_UNIT = XBRLUnit(
+    unit_id="USD",
+    unit_type=UnitType.MONETARY,
+    iso_currency_code="USD"
+)
+_STD_FACT = XBRLFact(
+    concept_qname="us-gaap:NetIncomeLoss",
+    value="1234567890",
+    value_type="numeric",
+    context_ref="FY2024Q4",
+    unit_ref="USD",
+    decimals=-6
+)
+
+
 class TestXBRLModels(unittest.TestCase):
     """Test XBRL data model validation and serialization."""
     
@@ -51,17 +91,18 @@ class TestXBRLModels(unittest.TestCase):
     
     def test_xbrl_context_instant_period(self):
         """Test XBRLContext with instant (point-in-time) period."""
-        context = XBRLContext(
-            context_id="FY2024Q4",
-            entity_identifier="0001018724",
-            period_type=ContextPeriodType.INSTANT,
-            period_end=date(2024, 12, 31)
-        )
+        context = _STD_CONTEXT
         
         self.assertEqual(context.context_id, "FY2024Q4")
         self.assertEqual(context.period_type, ContextPeriodType.INSTANT)
         self.assertIsNone(context.period_start)
         self.assertEqual(context.period_end, date(2024, 12, 31))
+        with self.assertRaises(ValidationError):
+            context.context_id = "FY2025Q4"
+        
+        shifted = context.model_copy(update={"period_end": date(2025, 12, 31)})
+        self.assertEqual(shifted.period_end, date(2025, 12, 31))
+        self.assertEqual(context.period_end, date(2024, 12, 31))
     
     def test_xbrl_context_duration_period(self):
         """Test XBRLContext with duration (date range) period."""
@@ -117,14 +158,7 @@ class TestXBRLModels(unittest.TestCase):
     
     def test_xbrl_fact_creation(self):
         """Test XBRLFact model initialization."""
-        fact = XBRLFact(
-            concept_qname="us-gaap:NetIncomeLoss",
-            value="1234567890",
-            value_type="numeric",
-            context_ref="FY2024Q4",
-            unit_ref="USD",
-            decimals=-6
-        )
+        fact = _STD_FACT
         
         self.assertEqual(fact.concept_qname, "us-gaap:NetIncomeLoss")
         self.assertEqual(fact.value, "1234567890")
@@ -143,28 +177,100 @@ class TestXBRLModels(unittest.TestCase):
         self.assertEqual(len(fact.footnote_ids), 2)
         self.assertIn("fn_1", fact.footnote_ids)
     
-    def test_xbrl_instance_creation(self):
-        """Test XBRLInstance container model."""
-        context = XBRLContext(
-            context_id="FY2024",
-            entity_identifier="0001018724",
-            period_type=ContextPeriodType.INSTANT,
-            period_end=date(2024, 12, 31)
-        )
-        
-        unit = XBRLUnit(
-            unit_id="USD",
-            unit_type=UnitType.MONETARY,
-            iso_currency_code="USD"
-        )
-        
+    def test_xbrl_fact_empty_collections(self):
+        """Test optional fact collections default to None with empty accessors."""
         fact = XBRLFact(
             concept_qname="us-gaap:NetIncomeLoss",
             value="1000",
-            context_ref="FY2024",
-            unit_ref="USD"
+            context_ref="FY2024Q4"
         )
         
+        self.assertIsNone(fact.footnote_ids)
+        self.assertIsNone(fact.xml_attributes)
+        self.assertEqual(len(fact.get_footnote_ids()), 0)
+        self.assertEqual(dict(fact.get_xml_attributes()), {})
+    
+    def test_xbrl_fact_id_lazy(self):
+        """Test fact IDs are generated once on access or taken from the caller."""
+        fact = XBRLFact(concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        self.assertIsNone(fact._fact_id)
+        self.assertEqual(fact.fact_id, fact.fact_id)
+        self.assertEqual(fact.model_dump()['fact_id'], fact.fact_id)
+        
+        fact = XBRLFact(fact_id="fact-1", concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        self.assertEqual(fact.fact_id, "fact-1")
+    
+    def test_xbrl_fact_equality_ignores_fact_id(self):
+        """Test reading fact_id does not make equal facts compare unequal."""
+        first = XBRLFact(concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        second = XBRLFact(concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        first.fact_id
+        
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, second.model_copy(update={"context_ref": "FY2023"}))
+    
+    def test_enums_compare_as_str(self):
+        """Test enums keep str values and str's C-level equality."""
+        for enum_cls in (XBRLFileType, UnitType, ContextPeriodType, DimensionMemberType):
+            self.assertIs(enum_cls.__eq__, str.__eq__)
+            for member in enum_cls:
+                self.assertEqual(member, member.value)
+        self.assertEqual(XBRLFileType.INSTANCE, "instance")
+    
+    def test_xbrl_fact_construct_shares_fields_set(self):
+        """Test constructed facts are frozen and share one fields-set."""
+        fields = dict(
+            concept_qname="us-gaap:Revenue", value="100", value_type="numeric",
+            context_ref="FY2024", unit_ref="USD", decimals=-3, is_nil=False,
+        )
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            facts = [XBRLFact.model_construct(**fields) for _ in range(1000)]
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        per_fact = (after - before) / len(facts)
+        
+        self.assertIs(facts[0].model_fields_set, facts[1].model_fields_set)
+        self.assertEqual(facts[0].model_fields_set, set(fields))
+        self.assertLess(per_fact, 1000)
+        with self.assertRaises(ValidationError):
+            facts[0].value = "200"
+        self.assertEqual(facts[0].model_copy(update={"value": "200"}).value, "200")
+        self.assertEqual(facts[0].model_fields_set, set(fields))
+    
+    def test_xbrl_fact_created_at_gated_by_provenance(self):
+        """Test per-fact timestamps are only recorded with debug provenance."""
+        fact = XBRLFact(concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        self.assertIsNone(fact.created_at)
+        
+        provenance_settings = dataclasses.replace(get_settings(), debug_provenance=True)
+        with patch('src.ingestion.models.settings', provenance_settings):
+            fact = XBRLFact(concept_qname="us-gaap:Revenue", context_ref="FY2024")
+        self.assertIsInstance(fact.created_at, datetime)
+    
+    def test_xbrl_fact_interns_identifiers(self):
+        """Test repeated fact identifiers share one string object."""
+        facts = [
+            XBRLFact(
+                concept_qname="".join(["us-gaap:", "Revenue"]),
+                value="1000",
+                context_ref="".join(["FY", "2024"]),
+            )
+            for _ in range(2)
+        ]
+        
+        self.assertIs(facts[0].concept_qname, facts[1].concept_qname)
+        self.assertIs(facts[0].context_ref, facts[1].context_ref)
+    
+    def test_xbrl_instance_creation(self):
+        """Test XBRLInstance container model."""
+        context = _STD_CONTEXT
+        unit = _STD_UNIT
+        fact = _STD_FACT
+        
         instance = XBRLInstance(
             file_path="data/raw/instance.xml",
             entity_identifier="0001018724",
@@ -177,6 +283,20 @@ class TestXBRLModels(unittest.TestCase):
         self.assertEqual(instance.fact_count, 1)
         self.assertEqual(instance.context_count, 1)
         self.assertEqual(instance.unit_count, 1)
+        
+        table = instance.to_arrow()
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.column('concept_qname')[0].as_py(), "us-gaap:NetIncomeLoss")
+        
+        # Counts follow reassignment of the underlying lists
+        instance.facts = [fact, fact]
+        self.assertEqual(instance.fact_count, 2)
+        
+        # ... and copies that replace them
+        copy = instance.model_copy(update={'facts': [fact, fact, fact], 'units': []})
+        self.assertEqual(copy.fact_count, 3)
+        self.assertEqual(copy.unit_count, 0)
+        self.assertEqual(instance.fact_count, 2)
     
     def test_xbrl_instance_serialization(self):
         """Test XBRLInstance can be serialized to JSON-compatible format."""
@@ -189,77 +309,335 @@ class TestXBRLModels(unittest.TestCase):
         data = instance.model_dump(mode='json')
         self.assertIsInstance(data, dict)
         self.assertEqual(data['entity_identifier'], "0001018724")
+    
+    def test_to_arrow_stringifies_non_str_values(self):
+        """Test facts with int or Decimal values convert to the string value column."""
+        instance = XBRLInstance(
+            file_path="data/raw/instance.xml",
+            entity_identifier="0001018724",
+            facts=[
+                _STD_FACT.model_copy(update={"value": 1234567890}),
+                _STD_FACT.model_copy(update={"value": Decimal("1.25")}),
+                _STD_FACT.model_copy(update={"value": None}),
+            ],
+        )
+        
+        table = instance.to_arrow()
+        
+        self.assertEqual(table.column('value').to_pylist(), ["1234567890", "1.25", None])
+        self.assertEqual(table.column('numeric_value').to_pylist(), [1234567890.0, 1.25, None])
+    
+    def test_fact_table_numeric_value_column(self):
+        """Test numeric_value parses numeric facts and nulls everything else."""
+        fact_table = XBRLFactTable.from_pylists({
+            "concept_qname": ["us-gaap:Revenue", "dei:DocumentType", "us-gaap:Assets", "us-gaap:Equity"],
+            "concept_label": [None] * 4,
+            "value": ["-1.5e3", "10-K", None, "n/a"],
+            "value_type": ["numeric", "nonNumeric", "numeric", "numeric"],
+            "context_ref": ["FY2024"] * 4,
+            "unit_ref": ["USD", None, "USD", "USD"],
+            "decimals": [None] * 4,
+            "is_nil": [False, False, True, False],
+        })
+        
+        self.assertEqual(fact_table.numeric_value.to_pylist(), [-1500.0, None, None, None])
+    
+    def test_fact_table_normalized_values_round_by_decimals(self):
+        """Test numeric values are rounded to each fact's decimals."""
+        fact_table = XBRLFactTable.from_pylists({
+            "concept_qname": ["us-gaap:Revenue", "us-gaap:EarningsPerShareBasic", "dei:DocumentType", "us-gaap:Assets"],
+            "concept_label": [None] * 4,
+            "value": ["1234567", "2.956", "10-K", "5.5"],
+            "value_type": ["numeric", "numeric", "nonNumeric", "numeric"],
+            "context_ref": ["FY2024"] * 4,
+            "unit_ref": ["USD", "USDPerShare", None, "USD"],
+            "decimals": [-3, 2, None, None],
+            "is_nil": [False] * 4,
+        })
+        
+        normalized = fact_table.normalized_values()
+        
+        np.testing.assert_allclose(normalized[[0, 1, 3]], [1235000.0, 2.96, 5.5])
+        self.assertTrue(np.isnan(normalized[2]))
+    
+    def test_scale_facts_batch(self):
+        """Test a 10^5-fact table is scaled by its negative decimals in one call."""
+        n = 100_000
+        values = [str(1234567890 + i) for i in range(n)]
+        decimals = [(-6, -3, 2, None)[i % 4] for i in range(n)]
+        fact_table = XBRLFactTable.from_pylists({
+            "concept_qname": ["us-gaap:Revenue"] * n,
+            "concept_label": [None] * n,
+            "value": values,
+            "value_type": ["numeric"] * n,
+            "context_ref": ["FY2024"] * n,
+            "unit_ref": ["USD"] * n,
+            "decimals": decimals,
+            "is_nil": [False] * n,
+        })
+        
+        scaled = fact_table.scaled_values()
+        
+        parsed = np.array(values, dtype=np.float64)
+        divisors = np.array([(1e6, 1e3, 1.0, 1.0)[i % 4] for i in range(n)])
+        np.testing.assert_allclose(scaled, parsed / divisors)
+    
+    def test_xbrl_instance_fact_table(self):
+        """Test XBRLInstance with columnar fact storage."""
+        fact_table = XBRLFactTable.from_pylists({
+            "concept_qname": ["us-gaap:Revenue", "us-gaap:Revenue"],
+            "concept_label": [None, None],
+            "value": ["100", "200"],
+            "value_type": ["numeric", "numeric"],
+            "context_ref": ["FY2023", "FY2024"],
+            "unit_ref": ["USD", "USD"],
+            "decimals": [-3, None],
+            "is_nil": [False, False],
+        })
+        
+        instance = XBRLInstance(
+            file_path="data/raw/instance.xml",
+            entity_identifier="0001018724",
+            fact_table=fact_table
+        )
+        
+        self.assertEqual(instance.fact_count, 2)
+        facts = list(instance.iter_facts())
+        self.assertEqual([f.value for f in facts], ["100", "200"])
+        self.assertEqual(facts[0].decimals, -3)
+        
+        # Dumps carry the table's facts under facts, not the table itself
+        data = instance.model_dump(mode='json')
+        self.assertNotIn('fact_table', data)
+        self.assertEqual([f['value'] for f in data['facts']], ["100", "200"])
+        self.assertEqual(len(json.loads(instance.model_dump_json())['facts']), 2)
+        
+        # Arrow export keeps the dictionary-encoded columns
+        table = fact_table.to_arrow()
+        self.assertEqual(table.num_rows, 2)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("concept_qname").type))
+        
+        # Numeric values are parsed to float64 in one pass
+        self.assertEqual(fact_table.numeric_value.to_pylist(), [100.0, 200.0])
+        
+        # The list view is built once and reused
+        self.assertIs(instance.get_facts(), instance.get_facts())
+        self.assertEqual([f.context_ref for f in instance.get_facts()], ["FY2023", "FY2024"])
+
+
+# Small fixture documents, kept as bytes and written with write_bytes
+_VALID_XML_BYTES = b'<?xml version="1.0"?>\n<root></root>'
+_NO_DECLARATION_XML_BYTES = b"<root></root>"
+_XML_DECLARATION_BYTES = b'<?xml version="1.0"?>'
+_INVALID_TXT_BYTES = b"Not XML"
+
+# Big enough that reading a file whole stands out against the streaming
+# check, which holds at most two read chunks at once
+_LARGE_INSTANCE_SIZE = 4 * _WELL_FORMED_CHUNK
+
+
+def _traced_peak(func, *args, **kwargs):
+    """Call func and return (result, peak Python allocation in bytes during the call)."""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+SAMPLE_INSTANCE = """<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    xmlns:link="http://www.xbrl.org/2003/linkbase"
+    xmlns:xlink="http://www.w3.org/1999/xlink"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:xbrldi="http://xbrl.org/2006/xbrldi"
+    xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:us-gaap="http://fasb.org/us-gaap/2024"
+    xmlns:dei="http://xbrl.sec.gov/dei/2024">
+  <link:schemaRef xlink:type="simple" xlink:href="company-20241231.xsd"/>
+  <xbrli:context id="FY2024">
+    <xbrli:entity>
+      <xbrli:identifier scheme="http://www.sec.gov/CIK">0001018724</xbrli:identifier>
+    </xbrli:entity>
+    <xbrli:period>
+      <xbrli:startDate>2024-01-01</xbrli:startDate>
+      <xbrli:endDate>2024-12-31</xbrli:endDate>
+    </xbrli:period>
+  </xbrli:context>
+  <xbrli:context id="FY2024_Instant_US">
+    <xbrli:entity>
+      <xbrli:identifier scheme="http://www.sec.gov/CIK">0001018724</xbrli:identifier>
+      <xbrli:segment>
+        <xbrldi:explicitMember dimension="us-gaap:StatementGeographicalAxis">us-gaap:USMember</xbrldi:explicitMember>
+      </xbrli:segment>
+    </xbrli:entity>
+    <xbrli:period>
+      <xbrli:instant>2024-12-31</xbrli:instant>
+    </xbrli:period>
+  </xbrli:context>
+  <xbrli:unit id="USD">
+    <xbrli:measure>iso4217:USD</xbrli:measure>
+  </xbrli:unit>
+  <xbrli:unit id="USDPerShare">
+    <xbrli:divide>
+      <xbrli:unitNumerator><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unitNumerator>
+      <xbrli:unitDenominator><xbrli:measure>xbrli:shares</xbrli:measure></xbrli:unitDenominator>
+    </xbrli:divide>
+  </xbrli:unit>
+  <dei:DocumentType contextRef="FY2024">10-K</dei:DocumentType>
+  <us-gaap:NetIncomeLoss contextRef="FY2024" unitRef="USD" decimals="-6"> 1000000 </us-gaap:NetIncomeLoss>
+  <us-gaap:EarningsPerShareBasic contextRef="FY2024" unitRef="USDPerShare" decimals="2">2.95</us-gaap:EarningsPerShareBasic>
+  <us-gaap:Revenues contextRef="FY2024_Instant_US" unitRef="USD" xsi:nil="true"/>
+</xbrli:xbrl>
+"""
+SAMPLE_INSTANCE_BYTES = SAMPLE_INSTANCE.encode("utf-8")
 
 
 class TestXBRLFileHandler(unittest.TestCase):
     """Test file handling and discovery functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.handler = XBRLFileHandler()
-        self.temp_dir = tempfile.TemporaryDirectory()
+    @classmethod
+    def setUpClass(cls):
+        """Create one RAM-backed (tmpfs when available) directory for the class."""
+        shm = Path("/dev/shm")
+        cls._base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+        cls.temp_dir_path = Path(tempfile.mkdtemp(prefix=f"xbrl_tests_{os.getpid()}_", dir=cls._base))
+        # One handler for the class; tests that change its state patch it
+        cls.handler = XBRLFileHandler()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the class directory and everything the tests wrote."""
+        shutil.rmtree(cls.temp_dir_path, ignore_errors=True)
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        self.temp_dir.cleanup()
+    def setUp(self):
+        """Give each test its own subdirectory."""
+        self.temp_dir_name = str(self.temp_dir_path / self._testMethodName)
+        os.mkdir(self.temp_dir_name)
     
     def test_detect_instance_file(self):
         """Test detection of XBRL instance files."""
-        # Create mock files
-        instance_path = Path(self.temp_dir.name) / "company_10k.xml"
-        instance_path.touch()
-        
-        file_type = self.handler.detect_file_type(instance_path)
+        file_type = self.handler.detect_file_type(Path("company_10k.xml"))
         self.assertEqual(file_type, XBRLFileType.INSTANCE)
+        self.assertIs(XBRLFileHandler._classify_suffix("company_10k.xml"), file_type)
     
     def test_detect_schema_file(self):
         """Test detection of XBRL schema files."""
-        schema_path = Path(self.temp_dir.name) / "us-gaap_del.xsd"
-        schema_path.touch()
-        
-        file_type = self.handler.detect_file_type(schema_path)
+        file_type = self.handler.detect_file_type(Path("us-gaap_del.xsd"))
         self.assertEqual(file_type, XBRLFileType.SCHEMA)
+        self.assertIs(XBRLFileHandler._classify_suffix("us-gaap_del.xsd"), file_type)
     
     def test_detect_linkbase_file(self):
         """Test detection of XBRL linkbase files."""
-        linkbase_path = Path(self.temp_dir.name) / "us-gaap_pre.xml"
-        linkbase_path.touch()
-        
-        file_type = self.handler.detect_file_type(linkbase_path)
+        file_type = self.handler.detect_file_type(Path("us-gaap_pre.xml"))
         self.assertEqual(file_type, XBRLFileType.LINKBASE)
+        self.assertIs(XBRLFileHandler._classify_suffix("us-gaap_pre.xml"), file_type)
+        
+        hits = XBRLFileHandler._classify_suffix.cache_info().hits
+        self.assertIs(XBRLFileHandler._classify_suffix("us-gaap_pre.xml"), file_type)
+        self.assertEqual(XBRLFileHandler._classify_suffix.cache_info().hits, hits + 1)
     
+    def test_find_instances_prunes_taxonomy_dirs(self):
+        """Test instance discovery skips files under taxonomy directories."""
+        root = Path(self.temp_dir_name)
+        (root / "filings").mkdir()
+        (root / "Taxonomy").mkdir()
+        (root / "filings" / "company_10k.xml").touch()
+        (root / "Taxonomy" / "ind-as_10k.xml").touch()
+        (root / "filings" / "company.xsd").touch()
+
+        instances = self.handler.find_instances(str(root))
+        self.assertEqual([p.name for p in instances], ["company_10k.xml"])
+
+        flat = self.handler.find_instances(str(root), recursive=False)
+        self.assertEqual(flat, [])
+
+    def test_find_all_xbrl_files_by_type(self):
+        """Test discovery groups files by detected type."""
+        root = Path(self.temp_dir_name)
+        (root / "schemas").mkdir()
+        (root / "company_10k.xml").touch()
+        (root / "schemas" / "us-gaap_del.xsd").touch()
+        (root / "notes.txt").touch()
+
+        result = self.handler.find_all_xbrl_files(str(root))
+
+        self.assertEqual([p.name for p in result[XBRLFileType.INSTANCE]], ["company_10k.xml"])
+        self.assertEqual([p.name for p in result[XBRLFileType.SCHEMA]], ["us-gaap_del.xsd"])
+        self.assertEqual(result[XBRLFileType.OTHER], [])
+
     def test_validate_instance_file_not_found(self):
         """Test validation fails for non-existent file."""
         is_valid, error = self.handler.validate_instance_file("nonexistent.xml")
         self.assertFalse(is_valid)
         self.assertIn("not found", error.lower())
     
+    def test_validate_instance_file_directory(self):
+        """Test validation fails for a directory path."""
+        dir_path = Path(self.temp_dir_name) / "filing.xml"
+        dir_path.mkdir()
+
+        is_valid, error = self.handler.validate_instance_file(str(dir_path))
+        self.assertFalse(is_valid)
+        self.assertIn("not a file", error)
+
     def test_validate_instance_file_valid_xml(self):
         """Test validation passes for valid XML file."""
-        instance_path = Path(self.temp_dir.name) / "test_instance.xml"
-        instance_path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<root></root>')
-        
-        is_valid, error = self.handler.validate_instance_file(str(instance_path))
+        is_valid, error = self.handler.validate_instance_bytes(
+            _VALID_XML_BYTES, "test_instance.xml"
+        )
         self.assertTrue(is_valid)
         self.assertIsNone(error)
     
     def test_validate_instance_file_non_xml(self):
         """Test validation fails for non-XML file."""
-        txt_path = Path(self.temp_dir.name) / "test.txt"
-        txt_path.write_text("Not an XML file")
-        
-        is_valid, error = self.handler.validate_instance_file(str(txt_path))
+        is_valid, error = self.handler.validate_instance_bytes(_INVALID_TXT_BYTES, "test.txt")
         self.assertFalse(is_valid)
         self.assertIn("XML", error)
     
+    def _write_large_instance(self, name: str) -> Path:
+        """Write a well-formed instance of _LARGE_INSTANCE_SIZE bytes of facts."""
+        large_file = Path(self.temp_dir_name) / name
+        fact = b'<fact id="f">' + b"1" * 500 + b"</fact>\n"
+        with open(large_file, "wb") as f:
+            f.write(_XML_DECLARATION_BYTES + b"\n<root>\n")
+            f.write(fact * (_LARGE_INSTANCE_SIZE // len(fact)))
+            f.write(b"</root>\n")
+        return large_file
+    
+    def test_validate_instance_file_large(self):
+        """Test a large instance is checked for well-formedness without reading it whole."""
+        large_file = self._write_large_instance("large_10k.xml")
+        
+        result, peak = _traced_peak(
+            self.handler.validate_instance_file, str(large_file), check_well_formed=True
+        )
+        
+        self.assertEqual(result, (True, None))
+        self.assertLess(peak, 3 * _WELL_FORMED_CHUNK)
+        
+        with open(large_file, "r+b") as f:
+            f.truncate(_LARGE_INSTANCE_SIZE // 2)
+        is_valid, error = self.handler.validate_instance_file(str(large_file), check_well_formed=True)
+        self.assertFalse(is_valid)
+        self.assertIn("well-formed", error)
+    
+    def test_validate_instance_bytes_malformed(self):
+        """Test in-memory validation rejects malformed XML."""
+        is_valid, error = self.handler.validate_instance_bytes(b"<root><open></root>", "broken.xml")
+        self.assertFalse(is_valid)
+        self.assertIn("well-formed", error)
+    
     def test_batch_validate_instances(self):
         """Test batch validation of multiple files."""
         # Create test files
-        valid_file = Path(self.temp_dir.name) / "valid.xml"
-        valid_file.write_text('<?xml version="1.0"?>\n<root></root>')
+        valid_file = Path(self.temp_dir_name) / "valid.xml"
+        valid_file.write_bytes(_VALID_XML_BYTES)
         
-        invalid_file = Path(self.temp_dir.name) / "invalid.txt"
-        invalid_file.write_text("Not XML")
+        invalid_file = Path(self.temp_dir_name) / "invalid.txt"
+        invalid_file.write_bytes(_INVALID_TXT_BYTES)
         
         results = self.handler.batch_validate_instances([
             str(valid_file),
@@ -270,66 +648,553 @@ class TestXBRLFileHandler(unittest.TestCase):
         self.assertTrue(results[str(valid_file)][0])
         self.assertFalse(results[str(invalid_file)][0])
     
+    def test_batch_validate_large_instance(self):
+        """Test batch well-formedness checks stream a large file instead of reading it whole."""
+        large_file = self._write_large_instance("large_10k.xml")
+        truncated_file = Path(self.temp_dir_name) / "truncated.xml"
+        truncated_file.write_bytes(b'<?xml version="1.0"?>\n<root><fact>')
+        
+        results, peak = _traced_peak(
+            self.handler.batch_validate_instances,
+            [str(large_file), str(truncated_file)], check_well_formed=True
+        )
+        
+        self.assertEqual(results[str(large_file)], (True, None))
+        self.assertFalse(results[str(truncated_file)][0])
+        self.assertIn("well-formed", results[str(truncated_file)][1])
+        self.assertLess(peak, 3 * _WELL_FORMED_CHUNK)
+    
+    def test_batch_validate_instances_reuses_parser(self):
+        """Test well-formedness checks share one parser across files and calls."""
+        root = Path(self.temp_dir_name)
+        paths = [str(root / name) for name in ("first.xml", "broken.xml", "last.xml")]
+        Path(paths[0]).write_bytes(_VALID_XML_BYTES)
+        Path(paths[1]).write_bytes(b'<?xml version="1.0"?>\n<root><open></root>')
+        Path(paths[2]).write_bytes(_VALID_XML_BYTES)
+        
+        with patch.object(etree, 'XMLParser', wraps=etree.XMLParser) as mock_parser:
+            handler = XBRLFileHandler()
+            first = handler.batch_validate_instances(paths, check_well_formed=True)
+            second = handler.batch_validate_instances(paths, check_well_formed=True)
+            self.assertTrue(handler.validate_instance_bytes(_VALID_XML_BYTES, "memory.xml")[0])
+        
+        mock_parser.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertTrue(first[paths[0]][0])
+        self.assertFalse(first[paths[1]][0])
+        self.assertTrue(first[paths[2]][0])
+    
+    def test_batch_validate_thread_pool_matches_single_file(self):
+        """Test the thread-pool batch path agrees with validate_instance_file."""
+        root = Path(self.temp_dir_name)
+        (root / "no_decl.xml").write_bytes(_NO_DECLARATION_XML_BYTES)
+        (root / "short.xml").write_bytes(b"<?")
+        (root / "valid.xml").write_bytes(_VALID_XML_BYTES)
+        paths = [str(root / name) for name in
+                 ("missing.xml", "no_decl.xml", "short.xml", "valid.xml")]
+        
+        # Patched for this test only: the handler is shared by the class
+        with patch.object(self.handler, '_io_uring', None):
+            results = self.handler.batch_validate_instances(paths)
+            self.assertEqual(self.handler.batch_validate_instances([]), {})
+        
+        expected = {p: self.handler.validate_instance_file(p) for p in paths}
+        self.assertEqual(results, expected)
+    
+    def test_header_read_does_not_need_os_readv(self):
+        """Test header checks work where os.readv does not exist (e.g. Windows)."""
+        valid_file = Path(self.temp_dir_name) / "valid.xml"
+        valid_file.write_bytes(_VALID_XML_BYTES)
+        
+        with patch.dict(os.__dict__), patch.object(self.handler, '_io_uring', None):
+            os.__dict__.pop('readv', None)
+            self.assertEqual(self.handler.validate_instance_file(str(valid_file)), (True, None))
+            results = self.handler.batch_validate_instances([str(valid_file)])
+        
+        self.assertEqual(results, {str(valid_file): (True, None)})
+    
+    def test_batch_validate_falls_back_when_io_uring_fails(self):
+        """Test any io_uring failure, not only OSError, falls back to the thread pool."""
+        root = Path(self.temp_dir_name)
+        (root / "valid.xml").write_bytes(_VALID_XML_BYTES)
+        paths = [str(root / "valid.xml"), str(root / "missing.xml")]
+        failing = Mock(spec_set=["validate"])
+        failing.validate.side_effect = AttributeError("io_uring_queue_init")
+        
+        with patch.object(self.handler, '_io_uring', failing):
+            results = self.handler.batch_validate_instances(paths)
+            self.assertIsNone(self.handler._io_uring)
+        
+        failing.validate.assert_called_once_with(paths)
+        self.assertEqual(results, {p: self.handler.validate_instance_file(p) for p in paths})
+    
+    @unittest.skipUnless(_IO_URING_AVAILABLE, "liburing not available")
+    def test_io_uring_matches_single_file_validation(self):
+        """Test the io_uring backend agrees with validate_instance_file."""
+        root = Path(self.temp_dir_name)
+        (root / "folder.xml").mkdir()
+        (root / "notes.txt").write_bytes(_INVALID_TXT_BYTES)
+        (root / "no_decl.xml").write_bytes(_NO_DECLARATION_XML_BYTES)
+        paths = [str(root / "missing.xml"), str(root / "folder.xml"),
+                 str(root / "notes.txt"), str(root / "no_decl.xml")]
+        # Enough files to span more than one submission batch
+        for i in range(300):
+            instance = root / f"company_{i}.xml"
+            instance.write_bytes(_VALID_XML_BYTES)
+            paths.append(str(instance))
+
+        try:
+            results = _IoUringValidator().validate(paths)
+        except OSError as e:
+            self.skipTest(f"io_uring disabled: {e}")
+
+        expected = {p: self.handler.validate_instance_file(p) for p in paths}
+        self.assertEqual(results, expected)
+
+    def test_resolve_path_caches_misses(self):
+        """Test resolve_path memoizes misses until the cache is cleared."""
+        _resolve_cached.cache_clear()
+        base = Path(self.temp_dir_name)
+        
+        with self.assertRaises(CustomFileNotFoundError):
+            self.handler.resolve_path("late_10k.xml", base_dir=str(base))
+        
+        # A file created after the miss is not seen until the cache is cleared
+        (base / "late_10k.xml").touch()
+        with self.assertRaises(CustomFileNotFoundError):
+            self.handler.resolve_path("late_10k.xml", base_dir=str(base))
+        
+        _resolve_cached.cache_clear()
+        resolved = self.handler.resolve_path("late_10k.xml", base_dir=str(base))
+        self.assertEqual(resolved, base / "late_10k.xml")
+    
     def test_get_file_info(self):
         """Test getting file metadata."""
-        test_file = Path(self.temp_dir.name) / "test.xml"
-        test_file.write_text('<?xml version="1.0"?>')
+        test_file = Path(self.temp_dir_name) / "test.xml"
+        test_file.write_bytes(_XML_DECLARATION_BYTES)
         
-        info = self.handler.get_file_info(str(test_file))
+        with patch('src.ingestion.file_handler.os.stat', wraps=os.stat) as mock_stat:
+            info = self.handler.get_file_info(str(test_file))
         
+        mock_stat.assert_called_once()
         self.assertTrue(info['exists'])
         self.assertEqual(info['name'], 'test.xml')
         self.assertGreater(info['size_bytes'], 0)
         self.assertIn('file_type', info)
+        self.assertEqual(self.handler.get_file_info(str(test_file) + ".missing"), {"exists": False})
+    
+    def test_get_file_info_from_entry_matches_path(self):
+        """Entry-based file info matches the path-based result."""
+        base = Path(self.temp_dir_name)
+        (base / "company_10k.xml").write_bytes(_XML_DECLARATION_BYTES)
+        (base / "schema.xsd").write_bytes(_XML_DECLARATION_BYTES)
+        
+        with os.scandir(base) as it:
+            for entry in it:
+                self.assertEqual(
+                    self.handler.get_file_info_from_entry(entry),
+                    self.handler.get_file_info(entry.path),
+                )
+        
+        infos = {i['name']: i for i in self.handler.iter_file_info(base)}
+        self.assertEqual(infos['company_10k.xml']['file_type'], 'instance')
+        self.assertEqual(infos['schema.xsd']['extension'], '.xsd')
+        self.assertTrue(infos['schema.xsd']['is_file'])
+
+
+# Arelle controller shared by the parser tests. spec_set and seal make an
+# attribute the parser newly depends on fail loudly instead of quietly
+# growing a fresh child mock; a missing instance loads as None
+_CANNED_CNTLR = MagicMock(spec_set=["logHandler", "VERSION", "modelManager"])
+_CANNED_CNTLR.VERSION = "2.36.0"
+_CANNED_CNTLR.logHandler.setLevel.return_value = None
+_CANNED_CNTLR.modelManager.load.return_value = None
+seal(_CANNED_CNTLR)
 
 
 class TestXBRLParser(unittest.TestCase):
     """Test XBRL parsing functionality."""
     
-    @patch('src.ingestion.xbrl_parser.Cntlr')
-    def test_parser_initialization(self, mock_cntlr_class):
+    @classmethod
+    def setUpClass(cls):
+        """Patch Arelle's controller once and share one parser across tests."""
+        cls._cntlr_patcher = patch('src.ingestion.xbrl_parser.Cntlr')
+        cls.mock_cntlr_class = cls._cntlr_patcher.start()
+        cls.mock_cntlr_class.Cntlr.return_value = _CANNED_CNTLR
+        cls.parser = XBRLParser()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the shared controller patch."""
+        cls._cntlr_patcher.stop()
+    
+    def setUp(self):
+        """Clear call history on the shared controller mocks."""
+        self.mock_cntlr_class.reset_mock()
+    
+    def test_parser_initialization(self):
         """Test XBRLParser initialization."""
-        mock_controller = MagicMock()
-        mock_controller.VERSION = "2.36.0"
-        mock_cntlr_class.Cntlr.return_value = mock_controller
+        self.assertIsNotNone(self.parser.controller)
+        # Check controller was initialized (version may vary)
+        self.assertTrue(hasattr(self.parser.controller, 'logHandler'))
+    
+    def test_parse_file_not_found(self):
+        """Test parsing non-existent file raises error."""
+        with self.assertRaises(XBRLParseError):
+            self.parser.parse("nonexistent_file.xml")
+    
+    def test_validate_file_not_found(self):
+        """Test validation of non-existent file."""
+        is_valid, errors = self.parser.validate("nonexistent_file.xml")
         
+        self.assertFalse(is_valid)
+        self.assertGreater(len(errors), 0)
+    
+    def test_convert_fact_normalizes_values(self):
+        """Test fact conversion strips text and parses decimals."""
         parser = XBRLParser()
+        fact_elem = SimpleNamespace(
+            contextID=" FY2024 ",
+            qname="us-gaap:NetIncomeLoss",
+            value=" 1000 \n",
+            unitID="USD",
+            decimals="-3",
+            isNil=False,
+            concept=SimpleNamespace(baseXsdType="double"),
+        )
         
-        self.assertIsNotNone(parser.controller)
-        # Check controller was initialized (version may vary)
-        self.assertTrue(hasattr(parser.controller, 'logHandler'))
+        fact = parser._convert_fact(fact_elem)
+        
+        self.assertEqual(fact.value, "1000")
+        self.assertEqual(fact.context_ref, "FY2024")
+        self.assertEqual(fact.decimals, -3)
+        self.assertEqual(fact.value_type, "numeric")
+        self.assertIsNone(XBRLParser._parse_decimals("INF"))
+
     
-    @patch('src.ingestion.xbrl_parser.Cntlr')
-    def test_parse_file_not_found(self, mock_cntlr_class):
-        """Test parsing non-existent file raises error."""
-        mock_controller = MagicMock()
-        mock_cntlr_class.return_value = mock_controller
+    def _write_sample(self) -> Path:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        file_path = Path(temp_dir.name) / "company_10k.xml"
+        file_path.write_bytes(SAMPLE_INSTANCE_BYTES)
+        return file_path
+    
+    def test_parse_lxml_extracts_contexts_units_facts(self):
+        """Test lxml parsing walks contexts, units and facts without Arelle."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        
+        instance = parser.parse(str(file_path))
+        
+        _CANNED_CNTLR.modelManager.load.assert_not_called()
+        self.assertEqual(instance.entity_identifier, "0001018724")
+        self.assertEqual(instance.schema_ref, "company-20241231.xsd")
+        self.assertEqual(instance.fiscal_period_focus, "FY2024_Instant_US")
+        
+        contexts = {c.context_id: c for c in instance.contexts}
+        self.assertEqual(contexts["FY2024"].period_type, ContextPeriodType.DURATION)
+        self.assertEqual(contexts["FY2024"].period_start, date(2024, 1, 1))
+        self.assertEqual(contexts["FY2024"].period_end, date(2024, 12, 31))
+        dims = contexts["FY2024_Instant_US"].get_segment_dimensions()
+        self.assertEqual(dims[0].dimension_name, "us-gaap:StatementGeographicalAxis")
+        self.assertEqual(dims[0].member_name, "us-gaap:USMember")
         
+        units = {u.unit_id: u for u in instance.units}
+        self.assertEqual(units["USD"].unit_type, UnitType.MONETARY)
+        self.assertEqual(units["USD"].iso_currency_code, "USD")
+        self.assertEqual(units["USDPerShare"].numerator_iso_code, "USD")
+        self.assertEqual(units["USDPerShare"].unit_type, UnitType.SHARES)
+        
+        facts = {f.concept_qname: f for f in instance.facts}
+        self.assertEqual(instance.fact_count, 4)
+        self.assertEqual(facts["us-gaap:NetIncomeLoss"].value, "1000000")
+        self.assertEqual(facts["us-gaap:NetIncomeLoss"].decimals, -6)
+        self.assertEqual(facts["us-gaap:NetIncomeLoss"].value_type, "numeric")
+        self.assertEqual(facts["dei:DocumentType"].value_type, "nonNumeric")
+        self.assertTrue(facts["us-gaap:Revenues"].is_nil)
+        self.assertIsNone(facts["us-gaap:Revenues"].value)
+    
+    def test_parse_lxml_columnar_matches_objects(self):
+        """Test lxml columnar parsing yields the same facts as object mode."""
         parser = XBRLParser()
+        file_path = self._write_sample()
         
+        objects = parser.parse(str(file_path)).facts
+        table = parser.parse(str(file_path), columnar=True)
+        
+        self.assertEqual(table.facts, [])
+        self.assertEqual(
+            [f.model_dump(exclude={"fact_id"}) for f in table.iter_facts()],
+            [f.model_dump(exclude={"fact_id"}) for f in objects],
+        )
+
+    
+    def test_iter_facts_streams_same_facts(self):
+        """Test streaming facts matches the facts from a full parse."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        
+        streamed = parser.iter_facts(str(file_path))
+        
+        self.assertNotIsInstance(streamed, list)
+        self.assertEqual(
+            [f.model_dump(exclude={"fact_id"}) for f in streamed],
+            [f.model_dump(exclude={"fact_id"}) for f in parser.parse(str(file_path)).facts],
+        )
         with self.assertRaises(XBRLParseError):
-            parser.parse("nonexistent_file.xml")
+            list(parser.iter_facts("nonexistent_file.xml"))
+    
+    def test_iter_facts_interleaved_with_parse_keeps_prefixes(self):
+        """Test a parse() between streamed facts does not relabel the stream's QNames."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        other_path = file_path.with_name("other_prefixes.xml")
+        other_path.write_bytes(SAMPLE_INSTANCE_BYTES.replace(b"us-gaap:", b"gaap:").replace(b"xmlns:us-gaap", b"xmlns:gaap"))
+        expected = [f.concept_qname for f in parser.iter_facts(str(file_path))]
+        
+        streamed = parser.iter_facts(str(file_path))
+        concepts = [next(streamed).concept_qname]
+        other = parser.parse(str(other_path))
+        concepts.extend(f.concept_qname for f in streamed)
+        
+        self.assertEqual(concepts, expected)
+        self.assertTrue(any(f.concept_qname.startswith("gaap:") for f in other.facts))
+
+    
+    def test_parse_lxml_normalizes_dimension_prefixes(self):
+        """Test dimension QNames use the root's prefix for their namespace."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        file_path.write_text(SAMPLE_INSTANCE.replace(
+            '<xbrldi:explicitMember dimension="us-gaap:StatementGeographicalAxis">us-gaap:USMember',
+            '<xbrldi:explicitMember xmlns:gaap="http://fasb.org/us-gaap/2024" '
+            'dimension="gaap:StatementGeographicalAxis">gaap:USMember',
+        ))
+        
+        instance = parser.parse(str(file_path))
+        
+        context = next(c for c in instance.contexts if c.context_id == "FY2024_Instant_US")
+        dim = context.get_segment_dimensions()[0]
+        self.assertEqual(dim.dimension_name, "us-gaap:StatementGeographicalAxis")
+        self.assertEqual(dim.member_name, "us-gaap:USMember")
+        self.assertEqual(instance.namespace_declaration["us-gaap"], "http://fasb.org/us-gaap/2024")
+
+    
+    def test_parse_lxml_interns_repeated_identifiers(self):
+        """Test facts sharing a concept or context share one str object."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        extra = '<us-gaap:NetIncomeLoss contextRef="FY2024_Instant_US" unitRef="USD">5</us-gaap:NetIncomeLoss>'
+        file_path.write_text(SAMPLE_INSTANCE.replace('</xbrli:xbrl>', extra + '</xbrli:xbrl>'))
+        
+        facts = parser.parse(str(file_path)).facts
+        
+        net_income = [f for f in facts if f.concept_qname == "us-gaap:NetIncomeLoss"]
+        self.assertIs(net_income[0].concept_qname, net_income[1].concept_qname)
+        self.assertIs(net_income[0].unit_ref, net_income[1].unit_ref)
+        self.assertIs(facts[0].context_ref, facts[1].context_ref)
+
+    
+    def test_parse_many_matches_parse(self):
+        """Test parallel parsing returns one instance per path, in order."""
+        parser = XBRLParser()
+        first = self._write_sample()
+        second = first.with_name("company_10q.xml")
+        second.write_text(SAMPLE_INSTANCE.replace("0001018724", "0000320193"))
+        
+        instances = parser.parse_many([str(first), str(second)], workers=2)
+        
+        self.assertEqual([i.file_path for i in instances], [str(first), str(second)])
+        self.assertEqual(instances[1].entity_identifier, "0000320193")
+        self.assertEqual(instances[0].fact_count, parser.parse(str(first)).fact_count)
+
     
     @patch('src.ingestion.xbrl_parser.Cntlr')
-    def test_validate_file_not_found(self, mock_cntlr_class):
-        """Test validation of non-existent file."""
-        mock_controller = MagicMock()
-        mock_cntlr_class.return_value = mock_controller
+    def test_preload_taxonomy_is_not_removed_after_parse(self, mock_cntlr_class):
+        """Test a preloaded taxonomy stays loaded while instance models are removed."""
+        model_manager = mock_cntlr_class.Cntlr.return_value.modelManager
+        taxonomy_model = MagicMock(name="taxonomy")
+        instance_model = SimpleNamespace(errors=[], facts=[], contexts={}, units={})
+        model_manager.load.side_effect = [taxonomy_model, instance_model]
+        
+        parser = XBRLParser(use_lxml=False)
+        parser.preload_taxonomy("https://xbrl.fasb.org/us-gaap/2024/entire/us-gaap-entryPoint-std-2024.xsd")
+        parser.parse(str(self._write_sample()))
+        
+        model_manager.disclosureSystem.select.assert_called_once_with("efm-pragmatic")
+        model_manager.close.assert_called_once_with(instance_model)
+        
+        parser.close()
+        model_manager.close.assert_called_with(taxonomy_model)
+
+    
+    def test_convert_unit_uses_cached_measure_parsing(self):
+        """Test Arelle unit conversion classifies measure QNames through the cache."""
+        from arelle.ModelValue import qname
+        parser = XBRLParser()
+        usd = qname("http://www.xbrl.org/2003/iso4217", "iso4217:usd")
+        shares = qname("http://www.xbrl.org/2003/instance", "xbrli:shares")
+        _classify_measures.cache_clear()
+        
+        for _ in range(3):
+            unit = parser._convert_unit(" USD ", SimpleNamespace(measures=((usd,), ())))
+        per_share = parser._convert_unit(
+            "USDPerShare", SimpleNamespace(measures=((usd,), (shares,)))
+        )
+        
+        self.assertEqual(unit.unit_id, "USD")
+        self.assertEqual(unit.unit_type, UnitType.MONETARY)
+        self.assertEqual(unit.iso_currency_code, "USD")
+        self.assertEqual(per_share.unit_type, UnitType.SHARES)
+        self.assertEqual(per_share.numerator_iso_code, "USD")
+        self.assertEqual(_classify_measures.cache_info().hits, 2)
+    
+    def test_arelle_units_match_lxml_units(self):
+        """Test units from a real Arelle load classify the same as the lxml path."""
+        from arelle import Cntlr as arelle_cntlr
+        file_path = self._write_sample()
+        parser = XBRLParser(use_lxml=False)
+        parser._controller = arelle_cntlr.Cntlr(logFileName="logToBuffer")
+        self.addCleanup(parser.close)
         
+        arelle_units = {u.unit_id: u for u in parser.parse(str(file_path)).units}
+        lxml_units = {u.unit_id: u for u in self.parser.parse(str(file_path)).units}
+        
+        self.assertEqual(arelle_units["USD"].unit_type, UnitType.MONETARY)
+        self.assertEqual(arelle_units["USD"].iso_currency_code, "USD")
+        self.assertEqual(arelle_units["USDPerShare"].unit_type, UnitType.SHARES)
+        self.assertEqual(arelle_units["USDPerShare"].numerator_iso_code, "USD")
+        self.assertEqual(arelle_units, lxml_units)
+
+    
+    def test_convert_context_reads_optional_attributes(self):
+        """Test Arelle context conversion with present and missing attributes."""
+        parser = XBRLParser()
+        duration = SimpleNamespace(
+            period=SimpleNamespace(startDate=date(2024, 1, 1), endDate=date(2024, 12, 31)),
+            segMember={"us-gaap:StatementGeographicalAxis": "us-gaap:USMember"},
+            entityIdentifier=("http://www.sec.gov/CIK", " 0001018724 "),
+        )
+        
+        context = parser._convert_context("FY2024", duration)
+        bare = parser._convert_context("Bare", SimpleNamespace())
+        
+        self.assertEqual(context.period_type, ContextPeriodType.DURATION)
+        self.assertEqual(context.period_end, date(2024, 12, 31))
+        self.assertEqual(context.entity_identifier, "0001018724")
+        self.assertEqual(context.get_segment_dimensions()[0].member_name, "us-gaap:USMember")
+        self.assertEqual(bare.period_type, ContextPeriodType.INSTANT)
+        self.assertIsNone(bare.segment_dimensions)
+        self.assertEqual(bare.entity_identifier, "")
+
+    
+    @patch('src.ingestion.xbrl_parser.Cntlr')
+    def test_parse_with_validate_loads_once(self, mock_cntlr_class):
+        """Test parse(validate=True) reports validation from the same Arelle load."""
+        model_manager = mock_cntlr_class.Cntlr.return_value.modelManager
+        errors = [f"error {i}" for i in range(12)]
+        model_manager.load.return_value = SimpleNamespace(
+            errors=errors, facts=[], contexts={}, units={}
+        )
         parser = XBRLParser()
+        file_path = str(self._write_sample())
         
-        is_valid, errors = parser.validate("nonexistent_file.xml")
+        instance = parser.parse(file_path, validate=True)
         
+        model_manager.load.assert_called_once()
+        self.assertFalse(instance.validation_passed)
+        self.assertEqual(instance.validation_errors, errors)
+        self.assertIsNone(parser.parse(file_path).validation_passed)
+        
+        is_valid, validate_errors = parser.validate(file_path)
         self.assertFalse(is_valid)
-        self.assertGreater(len(errors), 0)
+        self.assertEqual(validate_errors, errors)
+        self.assertEqual(model_manager.load.call_count, 2)
+
+    
+    def test_extract_fiscal_period_prefers_named_instant(self):
+        """Test fiscal period picks an 'instant' context, else the first instant."""
+        parser = XBRLParser()
+        
+        def context(context_id, period_type):
+            return XBRLContext(
+                context_id=context_id,
+                entity_identifier="0001018724",
+                period_type=period_type,
+                period_end=date(2024, 12, 31),
+            )
+        
+        duration = context("FY2024", ContextPeriodType.DURATION)
+        first = context("AsOf2024", ContextPeriodType.INSTANT)
+        named = context("FY2024_Instant", ContextPeriodType.INSTANT)
+        
+        self.assertEqual(parser._extract_fiscal_period(None, [duration, first, named]), "FY2024_Instant")
+        self.assertEqual(parser._extract_fiscal_period(None, [duration, first]), "AsOf2024")
+        self.assertIsNone(parser._extract_fiscal_period(None, [duration]))
+
+    
+    def test_parse_lxml_shares_repeated_dimensions(self):
+        """Test contexts with the same member share one frozen XBRLDimension."""
+        parser = XBRLParser()
+        file_path = self._write_sample()
+        segment_context = SAMPLE_INSTANCE[
+            SAMPLE_INSTANCE.index('<xbrli:context id="FY2024_Instant_US">'):
+            SAMPLE_INSTANCE.index('<xbrli:unit id="USD">')
+        ]
+        file_path.write_text(SAMPLE_INSTANCE.replace(
+            segment_context,
+            segment_context + segment_context.replace("FY2024_Instant_US", "FY2024_Instant_US_2"),
+        ))
+        
+        contexts = {c.context_id: c for c in parser.parse(str(file_path)).contexts}
+        
+        first = contexts["FY2024_Instant_US"].get_segment_dimensions()[0]
+        self.assertIs(first, contexts["FY2024_Instant_US_2"].get_segment_dimensions()[0])
+        with self.assertRaises(ValidationError):
+            first.member_name = "us-gaap:CAMember"
+
+    
+    def test_fact_errors_skip_debug_logging_when_disabled(self):
+        """Test per-fact debug messages are only emitted with DEBUG enabled."""
+        parser = XBRLParser()
+        broken_fact = SimpleNamespace(contextID=2024)
+        
+        with patch('src.ingestion.xbrl_parser.logger') as mock_logger:
+            parser._debug = False
+            self.assertIsNone(parser._convert_fact(broken_fact))
+            mock_logger.debug.assert_not_called()
+            
+            parser._debug = True
+            self.assertIsNone(parser._convert_fact(broken_fact))
+            mock_logger.debug.assert_called_once()
+
+    
+    @patch('src.ingestion.xbrl_parser.Cntlr')
+    def test_lxml_parse_does_not_start_arelle(self, mock_cntlr_class):
+        """Test the Arelle controller is only created when first needed."""
+        parser = XBRLParser()
+        
+        parser.parse(str(self._write_sample()))
+        parser.close()
+        
+        mock_cntlr_class.Cntlr.assert_not_called()
+        self.assertIsNone(parser._controller)
+        
+        parser.validate(str(self._write_sample()))
+        mock_cntlr_class.Cntlr.assert_called_once()
 
 
 class TestIngestionPipeline(unittest.TestCase):
     """Integration tests for the full ingestion pipeline."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Share one file handler across the pipeline tests."""
+        cls.handler = XBRLFileHandler()
+    
     def test_models_and_handler_integration(self):
         """Test that models and file handler work together."""
-        handler = XBRLFileHandler()
+        handler = self.handler
         
         # Create test context and unit
         context = XBRLContext(
@@ -359,13 +1224,13 @@ class TestIngestionPipeline(unittest.TestCase):
     
     def test_file_validation_workflow(self):
         """Test complete file validation workflow."""
-        handler = XBRLFileHandler()
+        handler = self.handler
         
         # Create temporary test files
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create valid instance
             instance_file = Path(temp_dir) / "company_10k.xml"
-            instance_file.write_text('<?xml version="1.0"?>\n<instance></instance>')
+            instance_file.write_bytes(b'<?xml version="1.0"?>\n<instance></instance>')
             
             # Validate
             is_valid, error = handler.validate_instance_file(str(instance_file))
@@ -387,41 +1252,112 @@ class TestLoggingIntegration(unittest.TestCase):
         
         # Should be able to log without errors
         test_logger.info("Test logging message")
+    
+    def test_get_logger_is_memoized(self):
+        """Test repeated get_logger calls return the same configured logger."""
+        first = get_logger("test_ingestion_memo")
+        
+        self.assertIs(get_logger("test_ingestion_memo"), first)
+        self.assertEqual(len(first.handlers), 2)
+    
+    def test_json_formatter_emits_valid_json(self):
+        """Test formatted records parse as JSON with the static fields."""
+        formatter = JsonFormatter()
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "parsed %d facts", (3,), None)
+        
+        payload = json.loads(formatter.format(record))
+        
+        self.assertEqual(payload["message"], "parsed 3 facts")
+        self.assertEqual(payload["project"], get_settings().project_name)
+        expected = datetime.utcfromtimestamp(int(record.created)).isoformat()
+        self.assertEqual(payload["timestamp"][:19], expected)
+        self.assertEqual(len(payload["timestamp"]), 26)
+    
+    def test_json_stream_handler_writes_bytes(self):
+        """Test the console handler writes JSON lines to the binary buffer."""
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        handler = JsonStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "café", (), None)
+        
+        handler.handle(record)
+        
+        line = raw.getvalue()
+        self.assertTrue(line.endswith(b"\n"))
+        self.assertEqual(json.loads(line)["message"], "café")
+    
+    def test_json_stream_handler_keeps_text_order_and_terminator(self):
+        """Test buffered text is flushed before the record and the terminator is honoured."""
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        handler = JsonStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        handler.terminator = "\r\n"
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "parsed", (), None)
+        
+        stream.write("banner\n")
+        handler.handle(record)
+        
+        banner, line = raw.getvalue().split(b"\n", 1)
+        self.assertEqual(banner, b"banner")
+        self.assertTrue(line.endswith(b"}\r\n"))
+        self.assertEqual(json.loads(line)["message"], "parsed")
 
 
 class TestSettingsIntegration(unittest.TestCase):
     """Test settings integration with ingestion modules."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Bind the settings singleton once for the class."""
+        cls.app_settings = get_settings()
+    
     def test_settings_provides_paths(self):
         """Test that settings provide required paths."""
-        app_settings = get_settings()
+        app_settings = self.app_settings
         
         self.assertIsNotNone(app_settings.root_path)
         self.assertIsNotNone(app_settings.data_path)
         self.assertTrue(app_settings.root_path.exists())
-
-
-def run_tests():
-    """Run all tests with verbose output."""
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
     
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestXBRLModels))
-    suite.addTests(loader.loadTestsFromTestCase(TestXBRLFileHandler))
-    suite.addTests(loader.loadTestsFromTestCase(TestXBRLParser))
-    suite.addTests(loader.loadTestsFromTestCase(TestIngestionPipeline))
-    suite.addTests(loader.loadTestsFromTestCase(TestLoggingIntegration))
-    suite.addTests(loader.loadTestsFromTestCase(TestSettingsIntegration))
+    def test_settings_singleton_is_frozen_and_validated(self):
+        """Test settings load once, are read-only, and reject unknown environments."""
+        app_settings = self.app_settings
+        
+        self.assertIs(get_settings(), app_settings)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            app_settings.environment = "production"
+        with self.assertRaises(ValueError):
+            dataclasses.replace(app_settings, environment="qa")
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    def test_load_env_rereads_only_when_file_changes(self):
+        """Test .env is read once per modification time and can be skipped."""
+        settings_module = sys.modules[get_settings.__module__]
+        settings_module._load_env_file.cache_clear()
+        
+        settings_module.load_env()
+        settings_module.load_env()
+        self.assertEqual(settings_module._load_env_file.cache_info().misses, 1)
+        self.assertEqual(settings_module._load_env_file.cache_info().hits, 1)
+        
+        with patch.dict(os.environ, {settings_module.SKIP_ENV_VAR: "1"}):
+            settings_module.load_env()
+        self.assertEqual(settings_module._load_env_file.cache_info().hits, 1)
     
-    return result.wasSuccessful()
+    def test_settings_match_environment_names_case_insensitively(self):
+        """Test variables set settings whatever the case of their names."""
+        settings_module = sys.modules[get_settings.__module__]
+        
+        with patch.dict(os.environ, {"neo4j_user": "reader", "Logs_Path": "/tmp/xbrl-logs"}):
+            loaded = settings_module.Settings._load()
+        
+        self.assertEqual(loaded.neo4j_user, "reader")
+        self.assertEqual(loaded.logs_path, Path("/tmp/xbrl-logs"))
 
 
 if __name__ == "__main__":
-    success = run_tests()
-    sys.exit(0 if success else 1)
+    # pytest is the project's runner (see requirements.txt); running this file
+    # directly hands over to it so --lf and -n (pytest-xdist) work here too
+    import pytest
+    sys.exit(pytest.main([__file__, "-v", *sys.argv[1:]]))